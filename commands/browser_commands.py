@@ -8,10 +8,23 @@ from selenium.webdriver.chrome.options import Options as ChromeOptions
 from selenium.webdriver.firefox.options import Options as FirefoxOptions
 from selenium.webdriver.edge.options import Options as EdgeOptions
 from utils.logger import Logger
-from utils.helpers import take_screenshot
+from utils.helpers import take_screenshot, set_implicit_wait
 
 logger = Logger(__name__)
 
+def _track_navigation(driver):
+    """
+    Count page navigations on the driver so cached elements know when to locate again
+    """
+    driver.navigation_epoch = 0
+    for name in ('get', 'back', 'forward', 'refresh'):
+        def tracked(*args, _navigate=getattr(driver, name), **kwargs):
+            try:
+                return _navigate(*args, **kwargs)
+            finally:
+                driver.navigation_epoch += 1
+        setattr(driver, name, tracked)
+
 class BrowserCommands:
     def __init__(self, config):
         self.config = config
@@ -44,8 +57,10 @@ class BrowserCommands:
         else:
             raise ValueError(f"Unsupported browser type: {browser}")
         
-        # Set timeouts
-        self.driver.implicitly_wait(self.config.IMPLICIT_WAIT)
+        _track_navigation(self.driver)
+        
+        # Set timeouts; every wait is explicit, with IMPLICIT_WAIT as its default timeout
+        set_implicit_wait(self.driver, 0)
         self.driver.set_page_load_timeout(self.config.PAGE_LOAD_TIMEOUT)
         self.driver.maximize_window()
         
@@ -5,12 +5,86 @@ Element-related commands with dynamic selector support
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
 from utils.logger import Logger
-from utils.helpers import wait_for_element
+from utils.helpers import wait_for_element, wait_for_any
+from utils.selector_cache import get_by_method, parse_selector
 
 logger = Logger(__name__)
 
+class CachedElement:
+    """
+    Element handle that is located once and reused for every later call
+    
+    The element is located again after the browser navigates, and once more if it
+    has gone stale for any other reason.
+    Like the other element commands, a missing element makes actions return False or None.
+    When index is given, the handle refers to that position among all matches of the selector.
+    """
+    def __init__(self, element_commands, selector, selector_type=None, timeout=None, index=None, element=None):
+        self.element_commands = element_commands
+        self.selector = selector
+        self.selector_type = selector_type
+        self.timeout = timeout
+        self.index = index
+        self._element = element
+        self._epoch = getattr(element_commands.driver, 'navigation_epoch', None) if element is not None else None
+    
+    def _locate(self, refresh=False):
+        epoch = getattr(self.element_commands.driver, 'navigation_epoch', None)
+        if self._element is None or refresh or epoch != self._epoch:
+            if self.index is None:
+                self._element = self.element_commands.find(self.selector, self.selector_type, self.timeout)
+            else:
+                elements = self.element_commands.find_all(self.selector, self.selector_type)
+                self._element = elements[self.index] if self.index < len(elements) else None
+            self._epoch = epoch
+        return self._element
+    
+    def _apply(self, action, default):
+        element = self._locate()
+        if element is None:
+            return default
+        try:
+            return action(element)
+        except StaleElementReferenceException:
+            logger.info(f"Cached element went stale, finding it again: {self.selector}")
+            element = self._locate(refresh=True)
+            return action(element) if element is not None else default
+    
+    @property
+    def element(self):
+        """
+        The underlying WebElement, or None if it could not be found
+        """
+        return self._locate()
+    
+    @property
+    def text(self):
+        return self._apply(lambda element: element.text, None)
+    
+    def click(self):
+        logger.info(f"Clicking on cached element: {self.selector}")
+        return self._apply(lambda element: element.click() or True, False)
+    
+    def send_keys(self, *keys):
+        return self._apply(lambda element: element.send_keys(*keys) or True, False)
+    
+    def clear(self):
+        return self._apply(lambda element: element.clear() or True, False)
+    
+    def get_attribute(self, attribute):
+        return self._apply(lambda element: element.get_attribute(attribute), None)
+    
+    def is_checked(self):
+        return self._apply(lambda element: element.is_selected(), False)
+    
+    def is_displayed(self):
+        return self._apply(lambda element: element.is_displayed(), False)
+    
+    def is_enabled(self):
+        return self._apply(lambda element: element.is_enabled(), False)
+
 class ElementCommands:
     def __init__(self, driver, config):
         self.driver = driver
@@ -20,55 +94,13 @@ class ElementCommands:
         """
         Get the appropriate By method based on selector type
         """
-        selector_map = {
-            "css": By.CSS_SELECTOR,
-            "xpath": By.XPATH,
-            "id": By.ID,
-            "name": By.NAME,
-            "tag": By.TAG_NAME,
-            "class": By.CLASS_NAME,
-            "link_text": By.LINK_TEXT,
-            "partial_link_text": By.PARTIAL_LINK_TEXT
-        }
-        return selector_map.get(selector_type.lower(), By.CSS_SELECTOR)
+        return get_by_method(selector_type)
     
     def _parse_selector(self, selector, selector_type=None):
         """
-        Parse selector string based on prefix to determine the selector type and value
-        Supported formats:
-        - "#element_id" -> (By.ID, "element_id")
-        - ".class_name" -> (By.CLASS_NAME, "class_name")
-        - "@name_value" -> (By.NAME, "name_value")
-        - "//xpath/expression" -> (By.XPATH, "//xpath/expression")
-        - "tag.class" or any other CSS -> (By.CSS_SELECTOR, selector)
-        
-        If selector_type is explicitly provided, it will override the automatic detection.
-        """
-        if selector_type:
-            return self._get_by_method(selector_type), selector
-        
-        # Auto-detect selector type based on prefix
-        if selector.startswith('#') and ' ' not in selector and '>' not in selector and ',' not in selector:
-            # ID selector: #element_id
-            return By.ID, selector[1:]
-        elif selector.startswith('.') and ' ' not in selector and '>' not in selector and ',' not in selector:
-            # Class selector: .class_name
-            return By.CLASS_NAME, selector[1:]
-        elif selector.startswith('@'):
-            # Name selector: @name_value
-            return By.NAME, selector[1:]
-        elif selector.startswith('//') or selector.startswith('(//'):
-            # XPath selector: //div[@id='element']
-            return By.XPATH, selector
-        elif selector.startswith('link='):
-            # Link text selector: link=Click Me
-            return By.LINK_TEXT, selector[5:]
-        elif selector.startswith('partial-link='):
-            # Partial link text selector: partial-link=Click
-            return By.PARTIAL_LINK_TEXT, selector[13:]
-        else:
-            # Default to CSS selector
-            return By.CSS_SELECTOR, selector
+        Parse selector string into a (By, value) locator; see utils.selector_cache.parse_selector
+        """
+        return parse_selector(selector, selector_type)
     
     def find(self, selector, selector_type=None, timeout=None):
         """
@@ -82,12 +114,12 @@ class ElementCommands:
         Returns:
             The found element or None if not found
         """
-        by_method, selector_value = self._parse_selector(selector, selector_type)
+        by_method, selector_value = parse_selector(selector, selector_type)
         wait_time = timeout if timeout is not None else self.config.IMPLICIT_WAIT
         
         logger.info(f"Finding element with {By.__name__}.{by_method}: {selector_value}")
         try:
-            element = wait_for_element(self.driver, (by_method, selector_value), wait_time)
+            element = wait_for_element(self.driver, (by_method, selector_value), wait_time, self.config.POLL_FREQUENCY)
             if element:
                 return element
             else:
@@ -97,22 +129,55 @@ class ElementCommands:
             logger.error(f"Error finding element with {By.__name__}.{by_method}: {selector_value} - {str(e)}")
             return None
     
-    def find_all(self, selector, selector_type=None):
+    def cached(self, selector, selector_type=None, timeout=None):
+        """
+        Get a handle that locates an element once and reuses it for repeated actions
+        
+        Args:
+            selector: The selector string (can include prefix for auto-detection)
+            selector_type: Optional explicit selector type. If provided, overrides auto-detection.
+            timeout: Optional timeout in seconds
+        
+        Returns:
+            A CachedElement exposing click(), text, is_checked() and similar methods
+        """
+        return CachedElement(self, selector, selector_type, timeout)
+    
+    def find_all_indexed(self, selector, selector_type=None):
+        """
+        Find all matching elements in one lookup and return reusable handles for each
+        
+        Args:
+            selector: The selector string (can include prefix for auto-detection)
+            selector_type: Optional explicit selector type. If provided, overrides auto-detection.
+        
+        Returns:
+            List of CachedElement handles, one per match, in document order
+        """
+        elements = self.find_all(selector, selector_type)
+        return [
+            CachedElement(self, selector, selector_type, index=index, element=element)
+            for index, element in enumerate(elements)
+        ]
+    
+    def find_all(self, selector, selector_type=None, timeout=None):
         """
         Find all elements matching the specified selector
         
         Args:
             selector: The selector string (can include prefix for auto-detection)
             selector_type: Optional explicit selector type. If provided, overrides auto-detection.
+            timeout: Optional timeout in seconds to wait for the first match
         
         Returns:
             List of found elements
         """
-        by_method, selector_value = self._parse_selector(selector, selector_type)
+        by_method, selector_value = parse_selector(selector, selector_type)
+        wait_time = timeout if timeout is not None else self.config.IMPLICIT_WAIT
         
         logger.info(f"Finding all elements with {By.__name__}.{by_method}: {selector_value}")
         try:
-            elements = self.driver.find_elements(by_method, selector_value)
+            elements = wait_for_any(self.driver, (by_method, selector_value), wait_time, self.config.POLL_FREQUENCY)
             logger.info(f"Found {len(elements)} elements")
             return elements
         except Exception as e:
@@ -133,7 +198,7 @@ class ElementCommands:
         """
         element = self.find(selector, selector_type, timeout)
         if element:
-            by_method, selector_value = self._parse_selector(selector, selector_type)
+            by_method, selector_value = parse_selector(selector, selector_type)
             logger.info(f"Clicking on element with {By.__name__}.{by_method}: {selector_value}")
             element.click()
             return True
@@ -155,7 +220,7 @@ class ElementCommands:
         
         element = self.find(selector, selector_type, timeout)
         if element:
-            by_method, selector_value = self._parse_selector(selector, selector_type)
+            by_method, selector_value = parse_selector(selector, selector_type)
             logger.info(f"Double-clicking on element with {By.__name__}.{by_method}: {selector_value}")
             ActionChains(self.driver).double_click(element).perform()
             return True
@@ -177,7 +242,7 @@ class ElementCommands:
         
         element = self.find(selector, selector_type, timeout)
         if element:
-            by_method, selector_value = self._parse_selector(selector, selector_type)
+            by_method, selector_value = parse_selector(selector, selector_type)
             logger.info(f"Right-clicking on element with {By.__name__}.{by_method}: {selector_value}")
             ActionChains(self.driver).context_click(element).perform()
             return True
@@ -199,7 +264,7 @@ class ElementCommands:
         
         element = self.find(selector, selector_type, timeout)
         if element:
-            by_method, selector_value = self._parse_selector(selector, selector_type)
+            by_method, selector_value = parse_selector(selector, selector_type)
             logger.info(f"Hovering over element with {By.__name__}.{by_method}: {selector_value}")
             ActionChains(self.driver).move_to_element(element).perform()
             return True
@@ -224,8 +289,8 @@ class ElementCommands:
         target = self.find(target_selector, target_type)
         
         if source and target:
-            source_by, source_value = self._parse_selector(source_selector, source_type)
-            target_by, target_value = self._parse_selector(target_selector, target_type)
+            source_by, source_value = parse_selector(source_selector, source_type)
+            target_by, target_value = parse_selector(target_selector, target_type)
             
             logger.info(f"Dragging element from {source_by}:{source_value} to {target_by}:{target_value}")
             ActionChains(self.driver).drag_and_drop(source, target).perform()
@@ -6,6 +6,7 @@ from selenium.webdriver.support.ui import Select
 from selenium.webdriver.common.keys import Keys
 from utils.logger import Logger
 from commands.element_commands import ElementCommands
+from utils.selector_cache import parse_selector
 
 logger = Logger(__name__)
 
@@ -34,7 +35,7 @@ class FormCommands:
             if clear_first:
                 element.clear()
             
-            by_method, selector_value = self.element_commands._parse_selector(selector, selector_type)
+            by_method, selector_value = parse_selector(selector, selector_type)
             logger.info(f"Typing '{text}' into element with {by_method}: {selector_value}")
             element.send_keys(text)
             return True
@@ -54,7 +55,7 @@ class FormCommands:
         """
         element = self.element_commands.find(selector, selector_type, timeout)
         if element:
-            by_method, selector_value = self.element_commands._parse_selector(selector, selector_type)
+            by_method, selector_value = parse_selector(selector, selector_type)
             logger.info(f"Clearing text from element with {by_method}: {selector_value}")
             element.clear()
             return True
@@ -74,7 +75,7 @@ class FormCommands:
         """
         element = self.element_commands.find(selector, selector_type, timeout)
         if element:
-            by_method, selector_value = self.element_commands._parse_selector(selector, selector_type)
+            by_method, selector_value = parse_selector(selector, selector_type)
             logger.info(f"Submitting form with {by_method}: {selector_value}")
             element.submit()
             return True
@@ -95,7 +96,7 @@ class FormCommands:
         """
         element = self.element_commands.find(selector, selector_type, timeout)
         if element:
-            by_method, selector_value = self.element_commands._parse_selector(selector, selector_type)
+            by_method, selector_value = parse_selector(selector, selector_type)
             logger.info(f"Selecting option '{text}' from dropdown with {by_method}: {selector_value}")
             select = Select(element)
             select.select_by_visible_text(text)
@@ -117,7 +118,7 @@ class FormCommands:
         """
         element = self.element_commands.find(selector, selector_type, timeout)
         if element:
-            by_method, selector_value = self.element_commands._parse_selector(selector, selector_type)
+            by_method, selector_value = parse_selector(selector, selector_type)
             logger.info(f"Selecting option with value '{value}' from dropdown with {by_method}: {selector_value}")
             select = Select(element)
             select.select_by_value(value)
@@ -139,7 +140,7 @@ class FormCommands:
         """
         element = self.element_commands.find(selector, selector_type, timeout)
         if element:
-            by_method, selector_value = self.element_commands._parse_selector(selector, selector_type)
+            by_method, selector_value = parse_selector(selector, selector_type)
             logger.info(f"Selecting option at index {index} from dropdown with {by_method}: {selector_value}")
             select = Select(element)
             select.select_by_index(index)
@@ -203,11 +204,11 @@ class FormCommands:
         element = self.element_commands.find(selector, selector_type, timeout)
         if element:
             if not element.is_selected():
-                by_method, selector_value = self.element_commands._parse_selector(selector, selector_type)
+                by_method, selector_value = parse_selector(selector, selector_type)
                 logger.info(f"Checking checkbox with {by_method}: {selector_value}")
                 element.click()
             else:
-                by_method, selector_value = self.element_commands._parse_selector(selector, selector_type)
+                by_method, selector_value = parse_selector(selector, selector_type)
                 logger.info(f"Checkbox with {by_method}: {selector_value} already checked")
             return True
         return False
@@ -227,11 +228,11 @@ class FormCommands:
         element = self.element_commands.find(selector, selector_type, timeout)
         if element:
             if element.is_selected():
-                by_method, selector_value = self.element_commands._parse_selector(selector, selector_type)
+                by_method, selector_value = parse_selector(selector, selector_type)
                 logger.info(f"Unchecking checkbox with {by_method}: {selector_value}")
                 element.click()
             else:
-                by_method, selector_value = self.element_commands._parse_selector(selector, selector_type)
+                by_method, selector_value = parse_selector(selector, selector_type)
                 logger.info(f"Checkbox with {by_method}: {selector_value} already unchecked")
             return True
         return False
@@ -270,7 +271,7 @@ class FormCommands:
         """
         element = self.element_commands.find(selector, selector_type, timeout)
         if element:
-            by_method, selector_value = self.element_commands._parse_selector(selector, selector_type)
+            by_method, selector_value = parse_selector(selector, selector_type)
             logger.info(f"Uploading file: {file_path} to input with {by_method}: {selector_value}")
             element.send_keys(file_path)
             return True
@@ -4,6 +4,7 @@ Validation-related commands with dynamic selector support
 
 from utils.logger import Logger
 from commands.element_commands import ElementCommands
+from utils.selector_cache import parse_selector
 
 logger = Logger(__name__)
 
@@ -26,7 +27,7 @@ class ValidationCommands:
             True if element exists, False otherwise
         """
         element = self.element_commands.find(selector, selector_type, timeout)
-        by_method, selector_value = self.element_commands._parse_selector(selector, selector_type)
+        by_method, selector_value = parse_selector(selector, selector_type)
         result = element is not None
         logger.info(f"Assert element exists with {by_method}: {selector_value} - {'PASS' if result else 'FAIL'}")
         return result
@@ -44,7 +45,7 @@ class ValidationCommands:
             True if element is visible, False otherwise
         """
         element = self.element_commands.find(selector, selector_type, timeout)
-        by_method, selector_value = self.element_commands._parse_selector(selector, selector_type)
+        by_method, selector_value = parse_selector(selector, selector_type)
         result = element is not None and element.is_displayed()
         logger.info(f"Assert element visible with {by_method}: {selector_value} - {'PASS' if result else 'FAIL'}")
         return result
@@ -62,7 +63,7 @@ class ValidationCommands:
             True if element is not visible, False otherwise
         """
         element = self.element_commands.find(selector, selector_type, timeout)
-        by_method, selector_value = self.element_commands._parse_selector(selector, selector_type)
+        by_method, selector_value = parse_selector(selector, selector_type)
         result = element is None or not element.is_displayed()
         logger.info(f"Assert element not visible with {by_method}: {selector_value} - {'PASS' if result else 'FAIL'}")
         return result
@@ -81,7 +82,7 @@ class ValidationCommands:
             True if text matches exactly, False otherwise
         """
         actual_text = self.element_commands.get_text(selector, selector_type, timeout)
-        by_method, selector_value = self.element_commands._parse_selector(selector, selector_type)
+        by_method, selector_value = parse_selector(selector, selector_type)
         result = actual_text == expected_text
         logger.info(f"Assert element text equals '{expected_text}' with {by_method}: {selector_value} - {'PASS' if result else 'FAIL'}")
         if not result and actual_text is not None:
@@ -102,7 +103,7 @@ class ValidationCommands:
             True if text is contained, False otherwise
         """
         actual_text = self.element_commands.get_text(selector, selector_type, timeout)
-        by_method, selector_value = self.element_commands._parse_selector(selector, selector_type)
+        by_method, selector_value = parse_selector(selector, selector_type)
         result = actual_text is not None and partial_text in actual_text
         logger.info(f"Assert element text contains '{partial_text}' with {by_method}: {selector_value} - {'PASS' if result else 'FAIL'}")
         if not result and actual_text is not None:
@@ -124,7 +125,7 @@ class ValidationCommands:
             True if attribute matches expected value, False otherwise
         """
         actual_value = self.element_commands.get_attribute(selector, attribute, selector_type, timeout)
-        by_method, selector_value = self.element_commands._parse_selector(selector, selector_type)
+        by_method, selector_value = parse_selector(selector, selector_type)
         result = actual_value == expected_value
         logger.info(f"Assert element attribute '{attribute}' equals '{expected_value}' with {by_method}: {selector_value} - {'PASS' if result else 'FAIL'}")
         if not result and actual_value is not None:
@@ -146,7 +147,7 @@ class ValidationCommands:
             True if attribute contains partial value, False otherwise
         """
         actual_value = self.element_commands.get_attribute(selector, attribute, selector_type, timeout)
-        by_method, selector_value = self.element_commands._parse_selector(selector, selector_type)
+        by_method, selector_value = parse_selector(selector, selector_type)
         result = actual_value is not None and partial_value in actual_value
         logger.info(f"Assert element attribute '{attribute}' contains '{partial_value}' with {by_method}: {selector_value} - {'PASS' if result else 'FAIL'}")
         if not result and actual_value is not None:
@@ -167,7 +168,7 @@ class ValidationCommands:
         """
         from commands.form_commands import FormCommands
         form_commands = FormCommands(self.driver, self.config)
-        by_method, selector_value = self.element_commands._parse_selector(selector, selector_type)
+        by_method, selector_value = parse_selector(selector, selector_type)
         result = form_commands.is_checked(selector, selector_type, timeout)
         logger.info(f"Assert element is checked with {by_method}: {selector_value} - {'PASS' if result else 'FAIL'}")
         return result
@@ -186,7 +187,7 @@ class ValidationCommands:
         """
         from commands.form_commands import FormCommands
         form_commands = FormCommands(self.driver, self.config)
-        by_method, selector_value = self.element_commands._parse_selector(selector, selector_type)
+        by_method, selector_value = parse_selector(selector, selector_type)
         result = not form_commands.is_checked(selector, selector_type, timeout)
         logger.info(f"Assert element is not checked with {by_method}: {selector_value} - {'PASS' if result else 'FAIL'}")
         return result
@@ -272,7 +273,7 @@ class ValidationCommands:
             True if count matches, False otherwise
         """
         elements = self.element_commands.find_all(selector, selector_type)
-        by_method, selector_value = self.element_commands._parse_selector(selector, selector_type)
+        by_method, selector_value = parse_selector(selector, selector_type)
         actual_count = len(elements)
         result = actual_count == expected_count
         logger.info(f"Assert element count equals {expected_count} for {by_method}: {selector_value} - {'PASS' if result else 'FAIL'}")
@@ -293,7 +294,7 @@ class ValidationCommands:
             True if count is greater than min_count, False otherwise
         """
         elements = self.element_commands.find_all(selector, selector_type)
-        by_method, selector_value = self.element_commands._parse_selector(selector, selector_type)
+        by_method, selector_value = parse_selector(selector, selector_type)
         actual_count = len(elements)
         result = actual_count > min_count
         logger.info(f"Assert element count greater than {min_count} for {by_method}: {selector_value} - {'PASS' if result else 'FAIL'}")
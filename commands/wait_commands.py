@@ -3,14 +3,38 @@ wait-related commands with dynamic selector support
 """
 
 import time
+from functools import lru_cache
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from utils.logger import Logger
 from commands.element_commands import ElementCommands
+from utils.selector_cache import parse_selector, JS_FINDERS, JS_IS_VISIBLE
+from utils.helpers import set_script_timeout, wait_for_elements
 
 logger = Logger(__name__)
 
+# Browser-side polling loop for wait_for_js; the predicate can read extra arguments from args.
+# The first check lets selector syntax errors escape so invalid selectors fail at once.
+_JS_WAIT_SCRIPT = """
+const args = Array.prototype.slice.call(arguments, 1, -1);
+const done = arguments[arguments.length - 1];
+const check = (strict) => {
+    try { return !!(%s); }
+    catch (e) { if (strict && e.name === 'SyntaxError') throw e; return false; }
+};
+if (check(true)) { done(true); return; }
+const timer = setInterval(() => { if (check()) { clearInterval(timer); clearTimeout(expiry); done(true); } }, 50);
+const expiry = setTimeout(() => { clearInterval(timer); done(check()); }, arguments[0]);
+"""
+
+# Locator-only conditions are built once per locator; selectors repeat across tests
+_visibility_condition = lru_cache(maxsize=512)(EC.visibility_of_element_located)
+_presence_condition = lru_cache(maxsize=512)(EC.presence_of_element_located)
+_clickable_condition = lru_cache(maxsize=512)(EC.element_to_be_clickable)
+
+_JS_IS_HIDDEN = "!(" + JS_IS_VISIBLE + ")(%s)"
+
 class WaitCommands:
     def __init__(self, driver, config):
         self.driver = driver
@@ -29,13 +53,13 @@ class WaitCommands:
         Returns:
             The element if visible, None otherwise
         """
-        by_method, selector_value = self.element_commands._parse_selector(selector, selector_type)
+        by_method, selector_value = parse_selector(selector, selector_type)
         wait_time = timeout if timeout is not None else self.config.IMPLICIT_WAIT
         
         logger.info(f"Waiting for element to be visible with {by_method}: {selector_value}")
         try:
             element = WebDriverWait(self.driver, wait_time).until(
-                EC.visibility_of_element_located((by_method, selector_value))
+                _visibility_condition((by_method, selector_value))
             )
             return element
         except TimeoutException:
@@ -54,10 +78,25 @@ class WaitCommands:
         Returns:
             True if element is invisible, False if still visible
         """
-        by_method, selector_value = self.element_commands._parse_selector(selector, selector_type)
+        by_method, selector_value = parse_selector(selector, selector_type)
         wait_time = timeout if timeout is not None else self.config.IMPLICIT_WAIT
         
         logger.info(f"Waiting for element to be invisible with {by_method}: {selector_value}")
+        
+        # Poll inside the browser when the locator can be expressed in JS
+        finder_js = JS_FINDERS.get(by_method)
+        if finder_js is not None:
+            started = time.monotonic()
+            try:
+                if self.wait_for_js(_JS_IS_HIDDEN % f"({finder_js})(args[0])", wait_time, selector_value):
+                    return True
+                logger.warning(f"Timeout waiting for element to be invisible with {by_method}: {selector_value}")
+                return False
+            except WebDriverException as e:
+                # Invalid selectors and page unloads end the script early; let WebDriver polling handle them
+                logger.info(f"In-browser wait failed, polling through WebDriver instead: {str(e)}")
+                wait_time = max(wait_time - (time.monotonic() - started), 0)
+        
         try:
             return WebDriverWait(self.driver, wait_time).until(
                 EC.invisibility_of_element_located((by_method, selector_value))
@@ -78,13 +117,13 @@ class WaitCommands:
         Returns:
             The element if present, None otherwise
         """
-        by_method, selector_value = self.element_commands._parse_selector(selector, selector_type)
+        by_method, selector_value = parse_selector(selector, selector_type)
         wait_time = timeout if timeout is not None else self.config.IMPLICIT_WAIT
         
         logger.info(f"Waiting for element to be present with {by_method}: {selector_value}")
         try:
             element = WebDriverWait(self.driver, wait_time).until(
-                EC.presence_of_element_located((by_method, selector_value))
+                _presence_condition((by_method, selector_value))
             )
             return element
         except TimeoutException:
@@ -103,13 +142,13 @@ class WaitCommands:
         Returns:
             The element if clickable, None otherwise
         """
-        by_method, selector_value = self.element_commands._parse_selector(selector, selector_type)
+        by_method, selector_value = parse_selector(selector, selector_type)
         wait_time = timeout if timeout is not None else self.config.IMPLICIT_WAIT
         
         logger.info(f"Waiting for element to be clickable with {by_method}: {selector_value}")
         try:
             element = WebDriverWait(self.driver, wait_time).until(
-                EC.element_to_be_clickable((by_method, selector_value))
+                _clickable_condition((by_method, selector_value))
             )
             return element
         except TimeoutException:
@@ -129,7 +168,7 @@ class WaitCommands:
         Returns:
             True if text is present, False otherwise
         """
-        by_method, selector_value = self.element_commands._parse_selector(selector, selector_type)
+        by_method, selector_value = parse_selector(selector, selector_type)
         wait_time = timeout if timeout is not None else self.config.IMPLICIT_WAIT
         
         logger.info(f"Waiting for element to contain text '{text}' with {by_method}: {selector_value}")
@@ -155,7 +194,7 @@ class WaitCommands:
         Returns:
             True if attribute has the value, False otherwise
         """
-        by_method, selector_value = self.element_commands._parse_selector(selector, selector_type)
+        by_method, selector_value = parse_selector(selector, selector_type)
         wait_time = timeout if timeout is not None else self.config.IMPLICIT_WAIT
         
         logger.info(f"Waiting for element to have attribute '{attribute}' with value '{value}' with {by_method}: {selector_value}")
@@ -282,7 +321,7 @@ class WaitCommands:
         Returns:
             True if element count matches, False otherwise
         """
-        by_method, selector_value = self.element_commands._parse_selector(selector, selector_type)
+        by_method, selector_value = parse_selector(selector, selector_type)
         wait_time = timeout if timeout is not None else self.config.IMPLICIT_WAIT
         
         logger.info(f"Waiting for element count to equal {count} with {by_method}: {selector_value}")
@@ -311,7 +350,7 @@ class WaitCommands:
         Returns:
             True if element count is greater than min_count, False otherwise
         """
-        by_method, selector_value = self.element_commands._parse_selector(selector, selector_type)
+        by_method, selector_value = parse_selector(selector, selector_type)
         wait_time = timeout if timeout is not None else self.config.IMPLICIT_WAIT
         
         logger.info(f"Waiting for element count to be greater than {min_count} with {by_method}: {selector_value}")
@@ -371,4 +410,48 @@ class WaitCommands:
             return WebDriverWait(self.driver, wait_time).until(are_ajax_requests_complete)
         except TimeoutException:
             logger.warning("Timeout waiting for AJAX requests to complete")
-            return False
\ No newline at end of file
+            return False
+    
+    def wait_for_js(self, predicate_js, timeout=None, *args):
+        """
+        Wait for a JavaScript expression to become truthy, polling inside the browser
+        
+        Args:
+            predicate_js: JavaScript expression to evaluate; extra arguments are available as args[0], args[1], ...
+            timeout: Optional timeout in seconds
+            *args: Values passed to the script for use in the predicate
+            
+        Returns:
+            True if the predicate became truthy, False on timeout
+        """
+        wait_time = timeout if timeout is not None else self.config.IMPLICIT_WAIT
+        
+        # The driver must wait a little longer than the in-page timer before giving up on the script
+        set_script_timeout(self.driver, wait_time + 1)
+        
+        try:
+            return bool(self.driver.execute_async_script(_JS_WAIT_SCRIPT % predicate_js, wait_time * 1000, *args))
+        except TimeoutException:
+            logger.warning(f"Timeout waiting for JavaScript condition: {predicate_js}")
+            return False
+    
+    def wait_for_elements_visible(self, selectors, selector_type=None, timeout=None):
+        """
+        Wait for several elements to be visible at once, polling for all of them inside the browser
+        
+        Args:
+            selectors: List of selector strings (can include prefix for auto-detection)
+            selector_type: Optional explicit selector type applied to every selector
+            timeout: Optional timeout in seconds
+            
+        Returns:
+            List of elements in the same order as selectors, or None on timeout
+        """
+        locators = [parse_selector(selector, selector_type) for selector in selectors]
+        wait_time = timeout if timeout is not None else self.config.IMPLICIT_WAIT
+        
+        logger.info(f"Waiting for {len(locators)} elements to be visible")
+        elements = wait_for_elements(self.driver, locators, wait_time)
+        if elements is None:
+            logger.warning(f"Timeout waiting for elements to be visible: {selectors}")
+        return elements
@@ -10,14 +10,30 @@ class Config:
     HEADLESS = os.environ.get("HEADLESS", "True").lower() == "false"
     IMPLICIT_WAIT = int(os.environ.get("IMPLICIT_WAIT", "10"))
     PAGE_LOAD_TIMEOUT = int(os.environ.get("PAGE_LOAD_TIMEOUT", "120"))
+    # Seconds between checks while waiting for an element
+    POLL_FREQUENCY = float(os.environ.get("POLL_FREQUENCY", "0.2"))
+    # Number of test files a browser runs before it is restarted
+    BROWSER_MAX_REUSE = int(os.environ.get("BROWSER_MAX_REUSE", "20"))
     
     # Screenshot settings
     SCREENSHOT_DIR = os.environ.get("SCREENSHOT_DIR", "screenshots")
     TAKE_SCREENSHOT_ON_FAILURE = os.environ.get("SCREENSHOT_ON_FAILURE", "True").lower() == "true"
     
+    # Let a reverse proxy send screenshot files instead of the Flask worker
+    # USE_X_SENDFILE is read by Flask itself (Apache mod_xsendfile, lighttpd)
+    # SCREENSHOT_ACCEL_REDIRECT is an nginx internal location aliased to SCREENSHOT_DIR
+    USE_X_SENDFILE = os.environ.get("USE_X_SENDFILE", "False").lower() == "true"
+    SCREENSHOT_ACCEL_REDIRECT = os.environ.get("SCREENSHOT_ACCEL_REDIRECT", "")
+    
+    # Longest time a results request may be held open waiting for changes
+    LONG_POLL_TIMEOUT = int(os.environ.get("LONG_POLL_TIMEOUT", "30"))
+    
     # Retry settings
     MAX_RETRIES = int(os.environ.get("MAX_RETRIES", "3"))
     RETRY_DELAY = int(os.environ.get("RETRY_DELAY", "1"))
+    # Each retry waits RETRY_BACKOFF times longer than the last, capped at RETRY_MAX_DELAY seconds
+    RETRY_BACKOFF = float(os.environ.get("RETRY_BACKOFF", "2"))
+    RETRY_MAX_DELAY = float(os.environ.get("RETRY_MAX_DELAY", "8"))
 
     # Login Credentials
     LOGIN_USERNAME = "tomsmith"
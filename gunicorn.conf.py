@@ -0,0 +1,14 @@
+"""
+Gunicorn settings for serving the Flask Selenium Testing Framework
+"""
+
+import os
+
+bind = os.environ.get("BIND", "0.0.0.0:5000")
+
+# Cooperative workers: Selenium calls, file serving and result polls all yield on I/O
+worker_class = "gevent"
+worker_connections = int(os.environ.get("WORKER_CONNECTIONS", "200"))
+
+# Test runs and their results live in process memory, so keep a single worker
+workers = 1
@@ -6,15 +6,20 @@ import os
 import json
 import threading
 import uuid
-import inspect
-import importlib.util
+import itertools
+import collections
 import concurrent.futures
 import logging
-from flask import request, jsonify, render_template, send_from_directory
+import math
+import mimetypes
+from urllib.parse import quote
+from flask import request, jsonify, render_template, send_from_directory, Response, abort
+from werkzeug.utils import safe_join
 
 from config import Config
 from test_runner import TestRunner
 from utils.logger import Logger
+from utils.helpers import discover_tests, iter_test_files, load_test_module, UpdateNotifier
 
 # Setup logging
 logger = Logger(__name__)
@@ -23,6 +28,86 @@ logger = Logger(__name__)
 test_results = {}
 active_tests = {}
 test_executors = {}  # Store executor instances for parallel tests
+parallel_updates = {}  # Change notifiers for long-polling parallel results
+
+# Maps path separators and dots to underscores when deriving per-file run ids
+_PATH_TO_ID = str.maketrans({'/': '_', '\\': '_', '.': '_'})
+
+# Serialized result payloads: run id -> (version, JSON body), least recently served first
+_response_cache = collections.OrderedDict()
+_response_cache_lock = threading.Lock()
+_RESPONSE_CACHE_SIZE = 256
+
+def _cached_json_response(run_id, version, build_payload):
+    """
+    Return a JSON response for a run, re-serializing the payload only when its version changes
+    
+    Only the most recently served runs are kept, so finished runs drop out once nobody polls them.
+    """
+    with _response_cache_lock:
+        cached = _response_cache.get(run_id)
+        if cached is not None:
+            _response_cache.move_to_end(run_id)
+    if cached is None or cached[0] != version:
+        cached = (version, json.dumps(build_payload()))
+        with _response_cache_lock:
+            _response_cache[run_id] = cached
+            _response_cache.move_to_end(run_id)
+            while len(_response_cache) > _RESPONSE_CACHE_SIZE:
+                _response_cache.popitem(last=False)
+    return Response(cached[1], mimetype='application/json')
+
+# Per-thread TestRunner reused by parallel workers
+_worker_state = threading.local()
+
+def _get_worker_runner(config, browser_type, runners):
+    """
+    Return the calling worker thread's TestRunner, starting its browser on first use
+    """
+    runner = getattr(_worker_state, 'runner', None)
+    if runner is not None and runner in runners and runner.browser_type == browser_type:
+        try:
+            # Clean state left by the previous file, restarting the browser when it is due
+            runner.reset_browser_session()
+            return runner
+        except Exception as e:
+            logger.error(f"Replacing worker browser that failed to reset: {str(e)}")
+    
+    runner = TestRunner(config)
+    runner.setup(browser_type)
+    _worker_state.runner = runner
+    runners.append(runner)
+    return runner
+
+def _bounded_as_completed(executor, fn, items, buffersize):
+    """
+    Yield fn(item) results as they finish, keeping at most buffersize calls in flight on the executor
+    
+    A new item is submitted as soon as any call finishes, so one slow file never holds back the rest.
+    Once the executor is shut down no more items are submitted; calls already running are still
+    yielded and cancelled ones are skipped.
+    """
+    items = iter(items)
+    pending = set()
+    
+    def submit(count):
+        nonlocal items
+        for item in itertools.islice(items, count):
+            try:
+                pending.add(executor.submit(fn, item))
+            except RuntimeError:
+                # The executor was shut down, e.g. by /api/stop_parallel; drop the remaining items
+                items = iter(())
+                return
+    
+    submit(buffersize)
+    while pending:
+        done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+        pending.difference_update(done)
+        for future in done:
+            submit(1)
+            if not future.cancelled():
+                yield future.result()
 
 def register_routes(app):
     """
@@ -39,8 +124,17 @@ def register_routes(app):
     @app.route('/screenshots/<path:filename>')
     def serve_screenshot(filename):
         """
-        Serve a screenshot file
+        Serve a screenshot file, handing the transfer to the proxy when configured
         """
+        accel_prefix = app.config.get('SCREENSHOT_ACCEL_REDIRECT')
+        if accel_prefix:
+            if safe_join('screenshots', filename) is None:
+                abort(404)
+            # The proxy replaces the body but keeps these headers, so give it the file's own type
+            return Response(
+                mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream',
+                headers={'X-Accel-Redirect': f"{accel_prefix.rstrip('/')}/{quote(filename)}"}
+            )
         return send_from_directory('screenshots', filename)
     
     # API routes for test management
@@ -50,6 +144,19 @@ def register_test_api_routes(app):
     """
     Register API routes for test management
     """
+    def wait_for_update(updates):
+        """
+        Hold a results request until updates moves past the client's ?since= version
+        """
+        since = request.args.get('since', type=int)
+        if since is not None:
+            wait = request.args.get('wait', 0, type=float)
+            # min() passes NaN through and a NaN timeout never expires; infinities are clamped below
+            if math.isnan(wait):
+                wait = 0
+            timeout = min(max(wait, 0), app.config['LONG_POLL_TIMEOUT'])
+            updates.wait(since, timeout)
+    
     @app.route('/api/tests', methods=['GET'])
     def get_tests():
         """
@@ -58,14 +165,13 @@ def register_test_api_routes(app):
         tests_dir = os.path.join(os.getcwd(), 'tests')
         tests = []
         
-        for root, _, files in os.walk(tests_dir):
-            for file in files:
-                if file.startswith('test_') and file.endswith('.py'):
-                    rel_path = os.path.relpath(os.path.join(root, file), tests_dir)
-                    tests.append({
-                        'path': rel_path,
-                        'name': os.path.splitext(rel_path)[0]
-                    })
+        for test_file in iter_test_files(tests_dir):
+            # Paths from scandir are already rooted at tests_dir, so slice instead of relpath
+            rel_path = test_file[len(tests_dir) + 1:]
+            tests.append({
+                'path': rel_path,
+                'name': rel_path[:-3]
+            })
         
         return jsonify(tests)
     
@@ -86,16 +192,10 @@ def register_test_api_routes(app):
         
         try:
             # Import the test module
-            module_name = os.path.basename(test_path).replace('.py', '')
-            spec = importlib.util.spec_from_file_location(module_name, full_path)
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
+            module = load_test_module(full_path)
             
             # Find all test functions
-            test_functions = []
-            for name, obj in inspect.getmembers(module):
-                if name.startswith('test_') and callable(obj):
-                    test_functions.append(name)
+            test_functions = [name for name, _ in discover_tests(module)]
             
             return jsonify(test_functions)
         except Exception as e:
@@ -119,11 +219,12 @@ def register_test_api_routes(app):
         # Create a unique ID for this test run
         run_id = str(uuid.uuid4())
         
+        config = Config()
+        # Override headless mode from request
+        config.HEADLESS = headless_mode
+        
         # Start the test in a separate thread
         def run_test_thread():
-            config = Config()
-            # Override headless mode from request
-            config.HEADLESS = headless_mode
             runner = TestRunner(config)
             active_tests[run_id] = runner
             
@@ -131,49 +232,28 @@ def register_test_api_routes(app):
                 full_path = os.path.join(os.getcwd(), 'tests', test_path)
                 
                 # Import the test module
-                module_name = os.path.basename(test_path).replace('.py', '')
-                spec = importlib.util.spec_from_file_location(module_name, full_path)
-                module = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(module)
+                module = load_test_module(full_path)
                 
                 # Set up the test environment
                 runner.setup(browser_type)
                 
                 try:
-                    results = {
-                        'total': 0,
-                        'passed': 0,
-                        'failed': 0,
-                        'skipped': 0,
-                        'tests': []
-                    }
-                    
                     # Run specific test functions if provided, otherwise run all
                     test_functions = []
                     if functions:
                         for func_name in functions:
                             if hasattr(module, func_name) and callable(getattr(module, func_name)):
-                                test_functions.append(getattr(module, func_name))
+                                test_functions.append((func_name, getattr(module, func_name)))
                     else:
-                        for name, obj in inspect.getmembers(module):
-                            if name.startswith('test_') and callable(obj):
-                                test_functions.append(obj)
+                        test_functions = discover_tests(module)
                     
-                    # Run each function
-                    for func in test_functions:
-                        result = runner.run_test(func)
-                        results['total'] += 1
-                        if result['status'] == 'passed':
-                            results['passed'] += 1
-                        elif result['status'] == 'failed':
-                            results['failed'] += 1
-                        else:
-                            results['skipped'] += 1
-                        
-                        results['tests'].append(result)
+                    # Run each function under the name it was listed by; the runner tallies the results
+                    for func_name, func in test_functions:
+                        runner.run_test(func, func_name)
                     
-                    # Store the results
-                    test_results[run_id] = results
+                    # Store the results and wake any long-polling clients
+                    test_results[run_id] = runner.results
+                    runner.updates.notify()
                     
                     logger.info(f"Test run {run_id} completed")
                 finally:
@@ -185,10 +265,10 @@ def register_test_api_routes(app):
                     'error': str(e),
                     'status': 'error'
                 }
+                runner.updates.notify()
             finally:
                 # Clean up
-                if run_id in active_tests:
-                    del active_tests[run_id]
+                active_tests.pop(run_id, None)
         
         thread = threading.Thread(target=run_test_thread)
         thread.daemon = True
@@ -204,26 +284,27 @@ def register_test_api_routes(app):
         """
         Get the results of a test run, including in-progress results
         """
+        runner = active_tests.get(run_id)
+        if runner is not None and run_id not in test_results:
+            wait_for_update(runner.updates)
+        
         if run_id in test_results:
-            # Test completed
-            return jsonify({
+            # Test completed, its results no longer change
+            return _cached_json_response(run_id, 'completed', lambda: {
                 'status': 'completed',
                 'results': test_results[run_id]
             })
-        elif run_id in active_tests:
+        elif runner is not None:
             # Test is still running, get partial results
-            runner = active_tests[run_id]
-            partial_results = getattr(runner, 'results', {
-                'total': 0,
-                'passed': 0,
-                'failed': 0,
-                'skipped': 0,
-                'tests': []
-            })
+            current_test = getattr(runner, 'current_test_name', None)
+            version = runner.updates.version
             
-            return jsonify({
+            # The runner bumps its version whenever a test starts or finishes
+            return _cached_json_response(run_id, ('running', version), lambda: {
                 'status': 'running',
-                'results': partial_results
+                'results': runner.results,
+                'current_test': current_test,
+                'version': version
             })
         else:
             return jsonify({
@@ -235,11 +316,11 @@ def register_test_api_routes(app):
         """
         Stop a running test
         """
-        if run_id in active_tests:
+        runner = active_tests.pop(run_id, None)
+        if runner:
             try:
                 # Try to tear down the test runner
-                active_tests[run_id].teardown()
-                del active_tests[run_id]
+                runner.teardown()
                 return jsonify({'status': 'stopped'})
             except Exception as e:
                 return jsonify({'status': 'error', 'message': str(e)}), 500
@@ -263,9 +344,18 @@ def register_test_api_routes(app):
         
         # Create a unique ID for this parallel test run
         parallel_run_id = str(uuid.uuid4())
+        updates = UpdateNotifier()
+        parallel_updates[parallel_run_id] = updates
+        
+        # One config for the whole run; workers only read it
+        config = Config()
+        config.HEADLESS = headless_mode
         
         # Create a thread to manage parallel execution
         def run_parallel_tests_thread():
+            # Runners started by the worker threads of this run, torn down once it finishes
+            worker_runners = []
+            executor = None
             try:
                 # Create a ThreadPoolExecutor for parallel execution
                 executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
@@ -286,12 +376,20 @@ def register_test_api_routes(app):
                 # Function to run a single test file
                 def run_test_file(test_path):
                     # Create a unique ID for this individual test
-                    run_id = f"{parallel_run_id}_{test_path.replace('/', '_').replace('.', '_')}"
+                    run_id = f"{parallel_run_id}_{test_path.translate(_PATH_TO_ID)}"
+                    
+                    if parallel_run_id not in test_executors:
+                        # The run was stopped; starting a browser now would outlive the run's teardown
+                        return {
+                            'run_id': run_id,
+                            'path': test_path,
+                            'status': 'stopped'
+                        }
                     
                     try:
-                        config = Config()
-                        config.HEADLESS = headless_mode
-                        runner = TestRunner(config)
+                        # Reuse this worker thread's browser across test files
+                        runner = _get_worker_runner(config, browser_type, worker_runners)
+                        runner.reset_results()
                         active_tests[run_id] = runner
                         
                         # Store initial status in combined results immediately
@@ -302,71 +400,50 @@ def register_test_api_routes(app):
                             'passed': 0,
                             'failed': 0
                         }
+                        updates.notify()
                         
                         full_path = os.path.join(os.getcwd(), 'tests', test_path)
                         
-                        # Set up test environment
-                        runner.setup(browser_type)
-                        
                         try:
-                            # Import the test module
-                            module_name = os.path.basename(test_path).replace('.py', '')
-                            spec = importlib.util.spec_from_file_location(module_name, full_path)
-                            module = importlib.util.module_from_spec(spec)
-                            spec.loader.exec_module(module)
+                            # Use the module imported up front, importing here only if that failed
+                            module = preloaded_modules.get(test_path) or load_test_module(full_path)
                             
                             # Find all test functions - respect selected functions if any
                             test_functions_to_run = []
                             selected_funcs = test_functions.get(test_path, [])
                             
-                            for name, obj in inspect.getmembers(module):
-                                if name.startswith('test_') and callable(obj):
-                                    # If specific functions are selected, only run those
-                                    if not selected_funcs or name in selected_funcs:
-                                        test_functions_to_run.append(obj)
+                            for name, obj in discover_tests(module):
+                                # If specific functions are selected, only run those
+                                if not selected_funcs or name in selected_funcs:
+                                    test_functions_to_run.append((name, obj))
                             
                             # Update total count in combined results
                             combined_results['test_files'][test_path]['total'] = len(test_functions_to_run)
+                            updates.notify()
                             
-                            # Initialize results
-                            results = {
-                                'total': len(test_functions_to_run),
-                                'passed': 0,
-                                'failed': 0,
-                                'skipped': 0,
-                                'tests': []
-                            }
-                            
-                            # Run each test function
-                            for func in test_functions_to_run:
+                            # Run each test function; the runner tallies this file's results
+                            for name, func in test_functions_to_run:
                                 # Run the test and get result
-                                result = runner.run_test(func)
+                                result = runner.run_test(func, name)
                                 
                                 # Update combined results after each test
-                                if result['status'] == 'passed':
-                                    combined_results['test_files'][test_path]['passed'] += 1
-                                elif result['status'] == 'failed':
-                                    combined_results['test_files'][test_path]['failed'] += 1
-                                
-                                # Add the result to the test's results
-                                results['tests'].append(result)
+                                if result.status in ('passed', 'failed'):
+                                    combined_results['test_files'][test_path][result.status] += 1
                                 
                                 # Also add to combined results with test path information
-                                test_result = result.copy()
+                                test_result = result.to_dict()
                                 test_result['test_path'] = test_path
                                 test_result['run_id'] = run_id
                                 combined_results['tests'].append(test_result)
-                            
-                            # Update final counts
-                            results['passed'] = sum(1 for t in results['tests'] if t['status'] == 'passed')
-                            results['failed'] = sum(1 for t in results['tests'] if t['status'] == 'failed')
-                            results['skipped'] = results['total'] - results['passed'] - results['failed']
+                                updates.notify()
                             
                             # Store results
+                            results = runner.results
                             test_results[run_id] = results
                             
                             # Update status in combined results
                             combined_results['test_files'][test_path]['status'] = 'completed'
+                            updates.notify()
                             
                             logger.info(f"Test run {run_id} completed")
                             
@@ -376,10 +453,8 @@ def register_test_api_routes(app):
                                 'results': results
                             }
                         finally:
-                            # Clean up
-                            runner.teardown()
-                            if run_id in active_tests:
-                                del active_tests[run_id]
+                            # Clean up; the browser stays open for the next file on this worker
+                            active_tests.pop(run_id, None)
                     except Exception as e:
                         logger.error(f"Error running test {run_id}: {str(e)}")
                         
@@ -392,6 +467,7 @@ def register_test_api_routes(app):
                             'error': str(e),
                             'status': 'error'
                         }
+                        updates.notify()
                         
                         return {
                             'run_id': run_id,
@@ -400,52 +476,65 @@ def register_test_api_routes(app):
                             'status': 'error'
                         }
                 
-                # Submit all test files to the executor
-                future_to_test = {executor.submit(run_test_file, test_path): test_path 
-                                for test_path in test_paths}
-                
-                # Process results as they complete
-                for future in concurrent.futures.as_completed(future_to_test):
-                    test_path = future_to_test[future]
+                # Import each distinct test file once and share the module with the workers
+                preloaded_modules = {}
+                for test_path in set(test_paths):
                     try:
-                        result = future.result()
-                        
-                        if 'results' in result:
-                            # Update combined stats
-                            file_results = result['results']
-                            combined_results['total'] += file_results['total']
-                            combined_results['passed'] += file_results['passed']
-                            combined_results['failed'] += file_results['failed']
-                            combined_results['skipped'] += file_results['skipped']
-                        else:
-                            # Handle error case
-                            combined_results['test_files'][test_path] = {
-                                'run_id': result['run_id'],
-                                'status': 'error',
-                                'error': result.get('error', 'Unknown error')
-                            }
+                        preloaded_modules[test_path] = load_test_module(os.path.join(os.getcwd(), 'tests', test_path))
                     except Exception as e:
-                        logger.error(f"Error processing results for {test_path}: {str(e)}")
+                        # The worker re-imports and reports the error against its file
+                        logger.error(f"Error importing test module {test_path}: {str(e)}")
+                
+                # Submit test files with bounded look-ahead and aggregate as each one finishes
+                for result in _bounded_as_completed(executor, run_test_file, test_paths, max_workers * 2):
+                    test_path = result['path']
+                    
+                    if result.get('status') == 'stopped':
+                        # Skipped because the run was stopped before it started
+                        continue
+                    elif 'results' in result:
+                        # Update combined stats
+                        file_results = result['results']
+                        combined_results['total'] += file_results['total']
+                        combined_results['passed'] += file_results['passed']
+                        combined_results['failed'] += file_results['failed']
+                        combined_results['skipped'] += file_results['skipped']
+                    else:
+                        # Handle error case
                         combined_results['test_files'][test_path] = {
+                            'run_id': result['run_id'],
                             'status': 'error',
-                            'error': str(e)
+                            'error': result.get('error', 'Unknown error')
                         }
+                    updates.notify()
                 
-                # Mark as completed
-                combined_results['status'] = 'completed'
+                # Mark as completed, or as stopped when /api/stop_parallel ended the run early
+                if parallel_run_id in test_executors:
+                    combined_results['status'] = 'completed'
+                else:
+                    combined_results['status'] = 'stopped'
+                updates.notify()
                 
-                logger.info(f"Parallel test run {parallel_run_id} completed")
+                logger.info(f"Parallel test run {parallel_run_id} {combined_results['status']}")
             except Exception as e:
                 logger.error(f"Error in parallel test execution {parallel_run_id}: {str(e)}")
                 test_results[parallel_run_id] = {
                     'error': str(e),
                     'status': 'error'
                 }
+                updates.notify()
             finally:
-                # Clean up
-                if parallel_run_id in test_executors:
-                    test_executors[parallel_run_id].shutdown(wait=False)
-                    del test_executors[parallel_run_id]
+                # Clean up; long-polls already waiting were woken by the final notify
+                parallel_updates.pop(parallel_run_id, None)
+                test_executors.pop(parallel_run_id, None)
+                if executor is not None:
+                    # Let files still running finish before their browsers are quit
+                    executor.shutdown(wait=True, cancel_futures=True)
+                for runner in worker_runners:
+                    try:
+                        runner.teardown()
+                    except Exception as e:
+                        logger.error(f"Error tearing down worker browser for {parallel_run_id}: {str(e)}")
         
         # Start parallel execution in a separate thread
         thread = threading.Thread(target=run_parallel_tests_thread)
@@ -464,10 +553,22 @@ def register_test_api_routes(app):
         """
         Get the results of a parallel test run
         """
+        # The notifier is removed once the run finishes, and finished results need no waiting
+        updates = parallel_updates.get(parallel_run_id)
+        if updates is not None:
+            wait_for_update(updates)
+        
         if parallel_run_id in test_results:
-            return jsonify({
-                'status': test_results[parallel_run_id].get('status', 'completed'),
-                'results': test_results[parallel_run_id]
+            combined_results = test_results[parallel_run_id]
+            status = combined_results.get('status', 'completed')
+            
+            # Every change to the combined results is followed by a notify, which bumps the version
+            update_version = updates.version if updates is not None else None
+            version = (update_version, status)
+            return _cached_json_response(parallel_run_id, version, lambda: {
+                'status': status,
+                'results': combined_results,
+                'version': update_version
             })
         elif parallel_run_id in test_executors:
             return jsonify({
@@ -483,18 +584,19 @@ def register_test_api_routes(app):
         """
         Stop a running parallel test execution
         """
-        if parallel_run_id in test_executors:
+        executor = test_executors.pop(parallel_run_id, None)
+        if executor:
             try:
                 # Shut down the executor
-                test_executors[parallel_run_id].shutdown(wait=False)
-                del test_executors[parallel_run_id]
+                executor.shutdown(wait=False)
                 
                 # Clean up any active tests
                 for run_id in list(active_tests.keys()):
                     if run_id.startswith(f"{parallel_run_id}_"):
                         try:
-                            active_tests[run_id].teardown()
-                            del active_tests[run_id]
+                            runner = active_tests.pop(run_id, None)
+                            if runner:
+                                runner.teardown()
                         except Exception as e:
                             logger.error(f"Error cleaning up test {run_id}: {str(e)}")
                 
@@ -21,6 +21,9 @@ document.addEventListener('DOMContentLoaded', function() {
     const errorScreenshotElement = document.getElementById('error-screenshot');
     const screenshotContainerElement = document.getElementById('screenshot-container');
 
+    // Seconds the server may hold a results request open waiting for changes
+    const LONG_POLL_WAIT = 25;
+
     // State variables
     const selectedTests = new Set();
     let selectedTestFile = null;
@@ -237,8 +240,12 @@ document.addEventListener('DOMContentLoaded', function() {
         // Store the test path when starting the poll, so we don't rely on selectedTestFile later
         const testPath = selectedTestFile; 
         
-        const interval = setInterval(() => {
-            fetch(`/api/results/${runId}`)
+        // Long-poll: once the server reports a version, each request waits for the next change
+        let version = null;
+        let stopped = false;
+        const poll = () => {
+            const query = version === null ? '' : `?since=${version}&wait=${LONG_POLL_WAIT}`;
+            fetch(`/api/results/${runId}${query}`)
                 .then(response => {
                     if (!response.ok) {
                         if (response.status === 404) {
@@ -254,6 +261,9 @@ document.addEventListener('DOMContentLoaded', function() {
                         // Do nothing, just wait for the next poll
                         return;
                     }
+                    if (data.version !== undefined) {
+                        version = data.version;
+                    }
                     
                     // Get test name from the stored path, not selectedTestFile which might change
                     let testName = "Unknown Test";
@@ -298,10 +308,16 @@ document.addEventListener('DOMContentLoaded', function() {
                                 updateFunctionStatus(rowId, test.status || 'running', test.error, test.screenshot);
                             });
                         }
+
+                        // Show the test currently executing, which is not in the results list yet
+                        if (data.current_test) {
+                            const rowId = addFunctionRow(tableId, data.current_test);
+                            updateFunctionStatus(rowId, 'running');
+                        }
                     }
                     // Handle completed results
                     else if (data.status === 'completed') {
-                        clearInterval(interval);
+                        stopped = true;
                         
                         // Update logs
                         testLogs.textContent += `Test run ${runId} completed\n`;
@@ -356,7 +372,7 @@ document.addEventListener('DOMContentLoaded', function() {
                         // Auto-scroll logs to bottom
                         testLogs.scrollTop = testLogs.scrollHeight;
                     } else if (data.status === 'error') {
-                        clearInterval(interval);
+                        stopped = true;
                         
                         // Update logs
                         testLogs.textContent += `Test run ${runId} encountered an error\n`;
@@ -381,12 +397,19 @@ document.addEventListener('DOMContentLoaded', function() {
                 .catch(error => {
                     console.error('Error polling results:', error);
                     testLogs.textContent += `Error polling results for run ${runId}: ${error.message}\n`;
-                    clearInterval(interval);
+                    stopped = true;
                     
                     // Auto-scroll logs to bottom
                     testLogs.scrollTop = testLogs.scrollHeight;
+                })
+                .finally(() => {
+                    if (!stopped) {
+                        // Short delay only while the run has not reported a version yet
+                        setTimeout(poll, version === null ? 500 : 0);
+                    }
                 });
-        }, 500); // Poll every 500ms for more responsive updates
+        };
+        poll();
     }
 
     
@@ -398,11 +421,18 @@ document.addEventListener('DOMContentLoaded', function() {
         // Keep track of created tables
         const testTables = {};
         
-        // Reduce polling interval for more responsive updates
-        const interval = setInterval(() => {
-            fetch(`/api/parallel_results/${parallelRunId}`)
+        // Long-poll: once the server reports a version, each request waits for the next change
+        let version = null;
+        let stopped = false;
+        const poll = () => {
+            const query = version === null ? '' : `?since=${version}&wait=${LONG_POLL_WAIT}`;
+            fetch(`/api/parallel_results/${parallelRunId}${query}`)
                 .then(response => response.json())
                 .then(data => {
+                    if (data.version !== undefined && data.version !== null) {
+                        version = data.version;
+                    }
+                    
                     // Update summary counters if available
                     if (data.results) {
                         if (data.results.total !== undefined) totalTests.textContent = data.results.total || 0;
@@ -482,7 +512,7 @@ document.addEventListener('DOMContentLoaded', function() {
                     
                     // Handle completed state
                     if (data.status === 'completed') {
-                        clearInterval(interval);
+                        stopped = true;
                         
                         // Update overall status
                         statusBadge.textContent = 'Completed';
@@ -490,7 +520,16 @@ document.addEventListener('DOMContentLoaded', function() {
                         
                         // Final update to logs
                         testLogs.textContent += `Parallel test run ${parallelRunId} completed\n`;
-                    } 
+                    }
+                    // Handle a run ended early by the stop button; the results so far are kept
+                    else if (data.status === 'stopped') {
+                        stopped = true;
+                        
+                        statusBadge.textContent = 'Stopped';
+                        statusBadge.className = 'badge bg-warning';
+                        
+                        testLogs.textContent += `Parallel test run ${parallelRunId} stopped\n`;
+                    }
                     // Handle running updates
                     else if (data.status === 'running') {
                         // Update progress indicator if we have test files info
@@ -514,9 +553,16 @@ document.addEventListener('DOMContentLoaded', function() {
                 .catch(error => {
                     console.error('Error polling parallel results:', error);
                     testLogs.textContent += `Error polling parallel results for run ${parallelRunId}: ${error.message}\n`;
-                    clearInterval(interval);
+                    stopped = true;
+                })
+                .finally(() => {
+                    if (!stopped) {
+                        // Short delay only while the run has not reported a version yet
+                        setTimeout(poll, version === null ? 500 : 0);
+                    }
                 });
-        }, 500); // Poll every 500ms for more responsive updates
+        };
+        poll();
     }
     
     /**
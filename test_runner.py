@@ -4,10 +4,14 @@ Test runner for executing Selenium tests
 
 import sys
 import os
-import importlib
-import inspect
+import logging
 import traceback
+import multiprocessing
+import concurrent.futures
+from collections import Counter
+from dataclasses import dataclass
 from utils.logger import Logger
+from utils.helpers import discover_tests, iter_test_files, load_test_module, save_screenshot_async, UpdateNotifier
 from commands.browser_commands import BrowserCommands
 from commands.element_commands import ElementCommands
 from commands.form_commands import FormCommands
@@ -17,29 +21,97 @@ from config import Config
 
 logger = Logger(__name__)
 
+def _run_test_file_in_process(config, test_file_path):
+    """
+    Run one test file with its own TestRunner and browser inside a worker process
+    """
+    runner = TestRunner(config)
+    # Tag screenshots with the pid so concurrent workers never overwrite each other's files
+    runner.screenshot_tag = str(os.getpid())
+    return runner.run_test_file(test_file_path)
+
+@dataclass(slots=True)
+class TestResult:
+    """
+    Outcome of a single test function
+    """
+    name: str
+    status: str = 'running'
+    error: str = None
+    error_type: str = None
+    selector: str = None
+    selector_type: str = None
+    timeout: float = None
+    screenshot: str = None
+    
+    def to_dict(self):
+        """
+        Convert the result to a plain dict for JSON responses and reports
+        """
+        return {
+            'name': self.name,
+            'status': self.status,
+            'error': self.error,
+            'error_type': self.error_type,
+            'selector': self.selector,
+            'selector_type': self.selector_type,
+            'timeout': self.timeout,
+            'screenshot': self.screenshot
+        }
+
+def _summarize(counter, tests):
+    """
+    Build the results dict reported to callers from a tally Counter and a list of TestResult
+    """
+    return {
+        'total': counter['total'],
+        'passed': counter['passed'],
+        'failed': counter['failed'],
+        'skipped': counter['skipped'],
+        'tests': [test.to_dict() for test in tests]
+    }
+
 class TestRunner:
     def __init__(self, config=None):
         self.config = config or Config()
+        self.browser_commands = None
         self.browser = None
         self.elements = None
         self.forms = None
         self.validation = None
         self.wait = None
-        self.results = {
-            'total': 0,
-            'passed': 0,
-            'failed': 0,
-            'skipped': 0,
-            'tests': []
-        }
+        self.browser_type = None
+        self.current_test_name = None
+        self.screenshot_tag = None
+        self.files_on_browser = 0
+        self._pending_screenshots = []
+        self.updates = UpdateNotifier()
+        self.reset_results()
+    
+    def reset_results(self):
+        """
+        Clear the accumulated results, e.g. before reusing the runner for another test file
+        """
+        self.counter = Counter()
+        self.test_results = []
+        self.updates.notify()
+    
+    @property
+    def results(self):
+        """
+        The accumulated results as a plain dict
+        """
+        return _summarize(self.counter, self.test_results)
     
     def setup(self, browser_type=None):
         """
         Set up the test environment
         """
         logger.info("Setting up test environment")
-        browser_commands = BrowserCommands(self.config)
-        self.browser = browser_commands.start(browser_type)
+        self.browser_commands = BrowserCommands(self.config)
+        self.browser = self.browser_commands.start(browser_type)
+        self.browser_type = browser_type
+        self.files_on_browser = 0
         
         self.elements = ElementCommands(self.browser, self.config)
         self.forms = FormCommands(self.browser, self.config)
@@ -51,48 +123,100 @@ class TestRunner:
         Tear down the test environment
         """
         logger.info("Tearing down test environment")
-        if hasattr(self, 'browser') and self.browser:
-            BrowserCommands(self.config).stop()
+        if self.browser_commands is not None:
+            self.browser_commands.stop()
+            self.browser_commands = None
+            self.browser = None
+        
+        # Don't leave screenshot writes running once the browser is gone
+        self._wait_for_screenshots()
+    
+    def reset_browser_session(self):
+        """
+        Prepare the running browser for the next test file
+        
+        Clears cookies and blanks the page so files don't see each other's state,
+        and restarts the browser once it has served BROWSER_MAX_REUSE files.
+        """
+        self.files_on_browser += 1
+        if self.files_on_browser >= self.config.BROWSER_MAX_REUSE:
+            logger.info("Restarting browser after reaching its reuse limit")
+            browser_type = self.browser_type
+            self.teardown()
+            self.setup(browser_type)
+        else:
+            self.browser.delete_all_cookies()
+            self.browser.get("about:blank")
     
-    def run_test(self, test_function):
+    def run_test(self, test_function, name=None):
         """
         Run a single test function with real-time updates
+        
+        The result is reported under name when given, otherwise under the function's __name__.
         """
-        test_name = test_function.__name__
+        test_name = name or test_function.__name__
         logger.info(f"Running test: {test_name}")
         
-        self.results['total'] += 1
-        result = {
-            'name': test_name,
-            'status': 'running',  # Set initial status to running
-            'error': None
-        }
+        self.counter['total'] += 1
+        result = TestResult(test_name)
         
-        # Add the test to results immediately with running status
-        self.results['tests'].append(result)
+        # Publish the running test by name; the result is appended once it is final
+        self.current_test_name = test_name
+        self.updates.notify()
         
         try:
             test_function(self)
-            self.results['passed'] += 1
-            result['status'] = 'passed'
+            self._record_outcome(result, 'passed')
             logger.info(f"Test passed: {test_name}")
         except Exception as e:
-            self.results['failed'] += 1
-            error_message = str(e)
-            error_traceback = traceback.format_exc()
-            logger.error(f"Test failed: {test_name} - {error_message}\n{error_traceback}")
-            
-            result['status'] = 'failed'
-            result['error'] = error_message
-            
-            if self.config.TAKE_SCREENSHOT_ON_FAILURE and hasattr(self, 'browser'):
-                from utils.helpers import take_screenshot
-                screenshot_path = take_screenshot(self.browser, f"failure_{test_name}")
-                logger.info(f"Failure screenshot saved: {screenshot_path}")
-                result['screenshot'] = screenshot_path   
+            logger.error(f"Test failed: {test_name} - {str(e)}")
+            # Formatting the traceback walks every frame, so only do it when it will be logged
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(traceback.format_exc())
+            self._record_outcome(result, 'failed', e)
+        
+        # The result is about to be published with its screenshot path, so the file must exist by now
+        self._wait_for_screenshots()
+        self.test_results.append(result)
+        self.current_test_name = None
+        self.updates.notify()
         return result
-
-
+    
+    def _record_outcome(self, result, status, exc=None):
+        """
+        Count the outcome and fill in the result, taking a screenshot for failures
+        """
+        self.counter[status] += 1
+        result.status = status
+        if exc is not None:
+            result.error = str(exc)
+            result.error_type = type(exc).__name__
+            if self.config.TAKE_SCREENSHOT_ON_FAILURE and self.browser is not None:
+                self._save_screenshot(result, "failure", result.name)
+    
+    def _save_screenshot(self, result, prefix, test_name):
+        """
+        Take a screenshot named after the test and record its path on the result
+        
+        The file is written in the background while the test is wrapped up; run_test waits
+        for the write before publishing the result.
+        """
+        screenshot_name = f"{prefix}_{test_name}"
+        if self.screenshot_tag:
+            screenshot_name += f"_{self.screenshot_tag}"
+        path, pending_write = save_screenshot_async(self.browser, screenshot_name)
+        self._pending_screenshots.append(pending_write)
+        
+        logger.info(f"{prefix.capitalize()} screenshot saved: {path}")
+        result.screenshot = path.removeprefix('screenshots/')
+        return path
+    
+    def _wait_for_screenshots(self):
+        """
+        Block until every screenshot taken so far has been written to disk
+        """
+        concurrent.futures.wait(self._pending_screenshots)
+        self._pending_screenshots = []
     
     def run_test_file(self, test_file_path):
         """
@@ -101,56 +225,36 @@ class TestRunner:
         logger.info(f"Running tests from file: {test_file_path}")
         
         # Import the test module
-        module_name = os.path.basename(test_file_path).replace('.py', '')
-        spec = importlib.util.spec_from_file_location(module_name, test_file_path)
-        module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)
+        module = load_test_module(test_file_path)
         
         # Find all test functions
-        test_functions = []
-        for name, obj in inspect.getmembers(module):
-            if name.startswith('test_') and callable(obj):
-                test_functions.append(obj)
+        test_functions = discover_tests(module)
         
-        # Setup the environment once for all tests
-        self.setup()
+        # Setup the environment once for all tests, unless the caller already started a browser
+        owns_browser = self.browser is None
+        if owns_browser:
+            self.setup()
         
-        results = {
-            'total': len(test_functions),
-            'passed': 0,
-            'failed': 0,
-            'skipped': 0,
-            'tests': []
-        }
+        counter = Counter(total=len(test_functions))
+        tests = []
         
         try:
             # Run each test function, continuing even if some fail
-            for func in test_functions:
+            for name, func in test_functions:
                 try:
-                    result = self.run_test(func)
-                    results['tests'].append(result)
-                    
-                    # Update counters
-                    if result['status'] == 'passed':
-                        results['passed'] += 1
-                    elif result['status'] == 'failed':
-                        results['failed'] += 1
-                    else:
-                        results['skipped'] += 1
+                    result = self.run_test(func, name)
                 except Exception as e:
                     # If run_test itself throws an exception, log it but continue
-                    logger.error(f"Error running test {func.__name__}: {str(e)}")
-                    results['failed'] += 1
-                    results['tests'].append({
-                        'name': func.__name__,
-                        'status': 'failed',
-                        'error': str(e)
-                    })
+                    logger.error(f"Error running test {name}: {str(e)}")
+                    result = TestResult(name, 'failed', str(e), type(e).__name__)
+                tests.append(result)
+                counter[result.status] += 1
         finally:
-            # Always clean up
-            self.teardown()
+            # Always clean up a browser started for this file
+            if owns_browser:
+                self.teardown()
         
-        return results
+        return _summarize(counter, tests)
         
     def run_test_directory(self, directory_path):
         """
@@ -166,39 +270,92 @@ class TestRunner:
             'tests': []
         }
         
-        # Find all test files
-        test_files = []
-        for root, _, files in os.walk(directory_path):
-            for file in files:
-                if file.startswith('test_') and file.endswith('.py'):
-                    test_files.append(os.path.join(root, file))
-        
-        # Run each test file
-        for test_file in test_files:
-            file_results = self.run_test_file(test_file)
-            results['total'] += file_results['total']
-            results['passed'] += file_results['passed']
-            results['failed'] += file_results['failed']
-            results['skipped'] += file_results['skipped']
-            results['tests'].extend(file_results['tests'])
+        # Run each test file found under the directory on one shared browser, started with the
+        # first file so a directory without tests starts none
+        owns_browser = self.browser is None
+        try:
+            for index, test_file in enumerate(iter_test_files(directory_path)):
+                if self.browser is None:
+                    self.setup()
+                elif index:
+                    self.reset_browser_session()
+                self._merge_results(results, self.run_test_file(test_file))
+        finally:
+            if owns_browser:
+                self.teardown()
         
         return results
     
+    def run_test_directory_parallel(self, directory_path, num_workers=None):
+        """
+        Run all tests in a directory, one test file per worker process
+        
+        Args:
+            directory_path: Directory to search for test_*.py files
+            num_workers: Optional number of worker processes (defaults to the CPU count)
+        
+        Returns:
+            Combined results for all test files
+        """
+        logger.info(f"Running tests from directory in parallel: {directory_path}")
+        
+        results = {
+            'total': 0,
+            'passed': 0,
+            'failed': 0,
+            'skipped': 0,
+            'tests': []
+        }
+        
+        # Spawn rather than fork: the parent may be a threaded Flask process
+        context = multiprocessing.get_context('spawn')
+        with concurrent.futures.ProcessPoolExecutor(max_workers=num_workers, mp_context=context) as executor:
+            futures = {
+                executor.submit(_run_test_file_in_process, self.config, test_file): test_file
+                for test_file in iter_test_files(directory_path)
+            }
+            for future in concurrent.futures.as_completed(futures):
+                test_file = futures[future]
+                try:
+                    self._merge_results(results, future.result())
+                except Exception as e:
+                    logger.error(f"Error running test file {test_file}: {str(e)}")
+                    results['total'] += 1
+                    results['failed'] += 1
+                    results['tests'].append(
+                        TestResult(os.path.basename(test_file), 'failed', str(e), type(e).__name__).to_dict()
+                    )
+        
+        return results
+    
+    def _merge_results(self, results, file_results):
+        """
+        Add one test file's results into the combined results
+        """
+        results['total'] += file_results['total']
+        results['passed'] += file_results['passed']
+        results['failed'] += file_results['failed']
+        results['skipped'] += file_results['skipped']
+        results['tests'].extend(file_results['tests'])
+    
     def print_results(self):
         """
         Print the test results
         """
-        logger.info("\n=== Test Results ===")
-        logger.info(f"Total tests: {self.results['total']}")
-        logger.info(f"Passed: {self.results['passed']}")
-        logger.info(f"Failed: {self.results['failed']}")
-        logger.info(f"Skipped: {self.results['skipped']}")
+        results = self.results
+        failed_tests = [test for test in results['tests'] if test['status'] == 'failed']
         
-        if self.results['failed'] > 0:
-            logger.info("\nFailed tests:")
-            for test in self.results['tests']:
-                if test['status'] == 'failed':
-                    logger.info(f"- {test['name']}: {test['error']}")
+        # Build the whole summary first so it is logged as a single record
+        lines = [
+            "\n=== Test Results ===",
+            f"Total tests: {results['total']}",
+            f"Passed: {results['passed']}",
+            f"Failed: {results['failed']}",
+            f"Skipped: {results['skipped']}"
+        ]
+        if failed_tests:
+            lines.append("\nFailed tests:")
+            lines.extend(f"- {test['name']}: {test['error']}" for test in failed_tests)
+        logger.info("\n".join(lines))
         
-        return self.results
-
+        return results
\ No newline at end of file
@@ -43,16 +43,16 @@ def _form_interactions(runner, formPage, checkboxesPage):
     # Navigate to checkboxes page
     runner.browser.get(checkboxesPage)
     
-    # Find and interact with checkboxes using XPath
-    checkboxes = runner.elements.find_all("//input[@type='checkbox']")
+    # Find all checkboxes with a single XPath lookup and index into them
+    checkboxes = runner.elements.find_all_indexed("//input[@type='checkbox']")
     
     # Check first checkbox if not already checked
-    if not runner.forms.is_checked("(//input[@type='checkbox'])[1]"):
-        runner.elements.click("(//input[@type='checkbox'])[1]")
+    if not checkboxes[0].is_checked():
+        checkboxes[0].click()
     
     # Verify both checkboxes are checked
-    assert runner.forms.is_checked("(//input[@type='checkbox'])[1]")
-    assert runner.forms.is_checked("(//input[@type='checkbox'])[2]")
+    assert checkboxes[0].is_checked()
+    assert checkboxes[1].is_checked()
 
 def _multiple_selector_types(runner, loginPage, username, password):
     """
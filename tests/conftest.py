@@ -4,10 +4,10 @@ Configuration for pytest
 
 import pytest
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="session")
 def selenium_runner():
     """
-    Fixture to provide a TestRunner instance for pytest
+    Fixture to provide a TestRunner instance for pytest, sharing one browser across the session
     """
     from flask_selenium_framework.test_runner import TestRunner
     runner = TestRunner()
@@ -15,4 +15,16 @@ def selenium_runner():
     
     yield runner
     
-    runner.teardown()
\ No newline at end of file
+    runner.teardown()
+
+@pytest.fixture(autouse=True)
+def clean_browser_session(request):
+    """
+    Clear cookies and leave the current page between tests that use the shared runner
+    """
+    yield
+    
+    if "selenium_runner" in request.fixturenames:
+        runner = request.getfixturevalue("selenium_runner")
+        runner.browser.delete_all_cookies()
+        runner.browser.get("about:blank")
\ No newline at end of file
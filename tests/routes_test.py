@@ -0,0 +1,122 @@
+"""
+Unit tests for the parallel-run plumbing in routes; these need no browser
+
+Named *_test.py so pytest collects them while the dashboard, which lists test_*.py files, does not.
+"""
+
+import concurrent.futures
+import threading
+import time
+import types
+
+import pytest
+from flask import Flask
+
+import routes
+import test_runner
+from config import Config
+from utils.helpers import UpdateNotifier
+
+def _slow_identity(item):
+    time.sleep(0.05)
+    return item
+
+def test_bounded_as_completed_yields_every_result():
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        results = list(routes._bounded_as_completed(executor, _slow_identity, range(8), 4))
+    
+    assert sorted(results) == list(range(8))
+
+def test_bounded_as_completed_stops_submitting_after_shutdown():
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+    # Shut down the way /api/stop_parallel does while the first files are still running
+    threading.Timer(0.02, executor.shutdown, kwargs={'wait': False}).start()
+    
+    results = list(routes._bounded_as_completed(executor, _slow_identity, range(8), 4))
+    
+    # Submitted calls still finish, but nothing is submitted once the executor is shut down
+    assert 0 < len(results) < 8
+    assert set(results) <= set(range(8))
+
+class _FakeRunner:
+    """
+    Stands in for TestRunner, tracking whether its "browser" is still open
+    """
+    created = []
+    
+    def __init__(self, config):
+        self.browser_type = None
+        self.alive = False
+        _FakeRunner.created.append(self)
+    
+    def setup(self, browser_type=None):
+        self.browser_type = browser_type
+        self.alive = True
+    
+    def teardown(self):
+        self.alive = False
+    
+    def reset_browser_session(self):
+        if not self.alive:
+            raise AttributeError("'NoneType' object has no attribute 'delete_all_cookies'")
+    
+    def reset_results(self):
+        pass
+    
+    def run_test(self, test_function, name=None):
+        test_function(self)
+        return test_runner.TestResult(name, 'passed')
+    
+    @property
+    def results(self):
+        return {'total': 1, 'passed': 1, 'failed': 0, 'skipped': 0, 'tests': []}
+
+def _slow_test_module(path):
+    module = types.ModuleType('slow_tests')
+    module.test_slow = lambda runner: time.sleep(0.05)
+    return module
+
+def _make_app(**config):
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    app.config.update(config)
+    routes.register_routes(app)
+    return app
+
+def test_stop_parallel_quits_every_browser(monkeypatch):
+    monkeypatch.setattr(routes, 'TestRunner', _FakeRunner)
+    monkeypatch.setattr(routes, 'load_test_module', _slow_test_module)
+    _FakeRunner.created.clear()
+    
+    client = _make_app().test_client()
+    
+    paths = [f"test_{index}.py" for index in range(8)]
+    run_id = client.post('/api/run_parallel', json={'paths': paths, 'max_workers': 2}).get_json()['parallel_run_id']
+    time.sleep(0.1)
+    assert client.post(f'/api/stop_parallel/{run_id}').get_json()['status'] == 'stopped'
+    
+    # The manager thread finishes in-flight files and then tears down every runner
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline and (run_id in routes.parallel_updates or any(r.alive for r in _FakeRunner.created)):
+        time.sleep(0.02)
+    
+    payload = client.get(f'/api/parallel_results/{run_id}').get_json()
+    assert payload['status'] == 'stopped'
+    assert 0 < len(payload['results']['tests']) < len(paths)
+    assert len(_FakeRunner.created) <= 2
+    assert not any(runner.alive for runner in _FakeRunner.created)
+
+@pytest.mark.parametrize('wait', ['nan', '-5', 'inf'])
+def test_long_poll_wait_is_capped(wait):
+    client = _make_app(LONG_POLL_TIMEOUT=0.2).test_client()
+    run_id = f"wait-{wait}"
+    routes.parallel_updates[run_id] = UpdateNotifier()
+    routes.test_results[run_id] = {'status': 'running', 'tests': [], 'test_files': {}}
+    
+    try:
+        started = time.monotonic()
+        client.get(f'/api/parallel_results/{run_id}?since={routes.parallel_updates[run_id].version}&wait={wait}')
+        assert time.monotonic() - started < 1
+    finally:
+        routes.parallel_updates.pop(run_id, None)
+        routes.test_results.pop(run_id, None)
@@ -3,26 +3,115 @@ Helper utilities for the framework
 """
 
 import os
+import logging
 import time
-from datetime import datetime
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
+import random
+import threading
+import weakref
+import importlib.util
+import itertools
+import concurrent.futures
+from functools import lru_cache, wraps
+from selenium.common.exceptions import TimeoutException, WebDriverException, StaleElementReferenceException, NoSuchElementException
+from utils.logger import Logger
+from utils.selector_cache import JS_FINDERS, JS_IS_VISIBLE
+from config import Config
+
+logger = Logger(__name__)
+
+class UpdateNotifier:
+    """
+    Version counter that lets readers block until a writer publishes a change
+    """
+    def __init__(self):
+        self.version = 0
+        self._condition = threading.Condition()
+    
+    def notify(self):
+        """
+        Bump the version and wake all waiting readers
+        """
+        with self._condition:
+            self.version += 1
+            self._condition.notify_all()
+    
+    def wait(self, seen_version, timeout):
+        """
+        Block until the version differs from seen_version or the timeout expires, then return it
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self.version != seen_version, timeout)
+            return self.version
+
+# Appended to screenshot names so several taken within the same second never collide
+_screenshot_counter = itertools.count(1)
+# Set once the screenshots directory has been created, so later screenshots skip the check
+_screenshot_dir_ready = False
+
+def screenshot_path(name=None):
+    """
+    Build a timestamped file path for a new screenshot, creating the screenshots directory if needed
+    """
+    global _screenshot_dir_ready
+    if not _screenshot_dir_ready:
+        os.makedirs("screenshots", exist_ok=True)
+        _screenshot_dir_ready = True
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
+    return f"screenshots/{name or 'screenshot'}_{timestamp}_{next(_screenshot_counter)}.png"
+
+# Screenshot files are written here so callers don't wait on disk I/O
+_screenshot_pool = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix='screenshot')
+
+def _write_png(path, png_bytes):
+    """
+    Write screenshot bytes to disk; runs on the screenshot pool
+    """
+    try:
+        try:
+            with open(path, 'wb') as png_file:
+                png_file.write(png_bytes)
+        except FileNotFoundError:
+            # The directory was removed after it was first created
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as png_file:
+                png_file.write(png_bytes)
+    except OSError as e:
+        logger.error(f"Error writing screenshot {path}: {str(e)}")
+
+def save_screenshot_async(driver, name=None):
+    """
+    Capture a screenshot now and write it to disk in the background
+    
+    The PNG is fetched from the driver on the calling thread, since WebDriver sessions
+    are not thread-safe; only the file write is deferred.
+    
+    Returns:
+        Tuple of (file path, Future that completes once the file is written)
+    """
+    filename = screenshot_path(name)
+    png_bytes = driver.get_screenshot_as_png()
+    return filename, _screenshot_pool.submit(_write_png, filename, png_bytes)
 
 def take_screenshot(driver, name=None):
     """
     Take a screenshot of the current browser window
+    
+    Returns:
+        Path of the screenshot, once the file has been written
     """
-    os.makedirs("screenshots", exist_ok=True)
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"screenshots/{name or 'screenshot'}_{timestamp}.png"
-    driver.save_screenshot(filename)
+    filename, written = save_screenshot_async(driver, name)
+    written.result()
     return filename
 
-def retry(func, max_retries=3, delay=1):
+# Errors fixed by finding the element again; the frozenset matches exact types without walking the MRO
+_REFIND_EXCEPTIONS = (StaleElementReferenceException, NoSuchElementException)
+_REFIND_EXACT = frozenset(_REFIND_EXCEPTIONS)
+
+def _make_retry_wrapper(func, max_retries, delay, backoff_factor, max_delay):
     """
-    Retry a function execution with delay between retries
+    Build the retrying wrapper for func with already resolved settings
     """
+    @wraps(func)
     def wrapper(*args, **kwargs):
         last_exception = None
         for attempt in range(max_retries):
@@ -31,18 +120,260 @@ def retry(func, max_retries=3, delay=1):
             except Exception as e:
                 last_exception = e
                 if attempt < max_retries - 1:
-                    time.sleep(delay)
+                    # Selenium messages carry a driver stacktrace; only trim one when it will be logged
+                    if logger.isEnabledFor(logging.WARNING):
+                        error_msg = str(e).split('\n', 1)[0]
+                        if len(error_msg) > 100:
+                            error_msg = error_msg[:97] + "..."
+                        logger.warning("Retrying %s (%d/%d) after error: %s", func.__name__, attempt + 1, max_retries - 1, error_msg)
+                    # A stale or missing element just needs finding again, so retry those straight away
+                    if type(e) not in _REFIND_EXACT and not isinstance(e, _REFIND_EXCEPTIONS):
+                        time.sleep(min(delay * backoff_factor ** attempt, max_delay) * (0.5 + random.random()))
         raise last_exception
     return wrapper
 
-def wait_for_element(driver, locator, timeout=10):
+def retry(func=None, max_retries=None, delay=None, backoff_factor=None, max_delay=None):
+    """
+    Retry a function execution with exponential backoff and jitter between retries
+    
+    Works as retry(func, ...), as a bare @retry decorator, or as @retry(max_retries=5, ...).
+    The first retry waits about delay seconds, each later one backoff_factor times longer,
+    capped at max_delay. Jitter of +/-50% keeps parallel runs from retrying in lockstep.
+    Stale and missing element errors are retried immediately.
+    Settings left as None come from Config and are resolved once, when the function is wrapped.
+    """
+    max_retries = Config.MAX_RETRIES if max_retries is None else max_retries
+    delay = Config.RETRY_DELAY if delay is None else delay
+    backoff_factor = Config.RETRY_BACKOFF if backoff_factor is None else backoff_factor
+    max_delay = Config.RETRY_MAX_DELAY if max_delay is None else max_delay
+    
+    if func is None:
+        return lambda decorated: _make_retry_wrapper(decorated, max_retries, delay, backoff_factor, max_delay)
+    return _make_retry_wrapper(func, max_retries, delay, backoff_factor, max_delay)
+
+@lru_cache(maxsize=256)
+def _scan_test_dir(path, mtime_ns):
+    """
+    List the subdirectories and test_*.py files directly inside path; cached until its mtime changes
+    """
+    subdirs = []
+    test_files = []
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.path)
+            elif entry.name.startswith('test_') and entry.name.endswith('.py'):
+                test_files.append(entry.path)
+    return tuple(subdirs), tuple(test_files)
+
+def iter_test_files(root):
+    """
+    Yield the paths of all test_*.py files under root, recursing into subdirectories
+    """
+    stack = [root]
+    while stack:
+        path = stack.pop()
+        subdirs, test_files = _scan_test_dir(path, os.stat(path).st_mtime_ns)
+        stack.extend(subdirs)
+        yield from test_files
+
+# Loaded test modules: path -> (mtime_ns, source hash, module)
+_module_cache = {}
+
+def load_test_module(path):
+    """
+    Import a test file from its path and return the module object, reusing it while the file is unchanged
+    """
+    mtime_ns = os.stat(path).st_mtime_ns
+    cached = _module_cache.get(path)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[2]
+    
+    # A touched but unmodified file keeps its module; only the stored mtime moves on
+    with open(path, 'rb') as source_file:
+        source_hash = importlib.util.source_hash(source_file.read())
+    if cached is not None and cached[1] == source_hash:
+        _module_cache[path] = (mtime_ns, source_hash, cached[2])
+        return cached[2]
+    
+    module_name = os.path.basename(path).replace('.py', '')
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    _module_cache[path] = (mtime_ns, source_hash, module)
+    return module
+
+def discover_tests(module):
+    """
+    Return (name, callable) pairs for the test_* callables in a module's own namespace, in definition order
+    
+    The name is the attribute name, which is what callers select tests by; aliases and
+    decorated functions may have a different __name__.
+    """
+    return [(name, obj) for name, obj in module.__dict__.items() if name.startswith('test_') and callable(obj)]
+
+# Last implicit wait sent to each driver, so repeating the same value skips the WebDriver call
+_implicit_waits = weakref.WeakKeyDictionary()
+
+# Same idea for the async script timeout used by in-browser waits
+_script_timeouts = weakref.WeakKeyDictionary()
+# One lock per driver keeps the recorded values in step with that driver when threads share it,
+# without making drivers on other threads wait for each other's WebDriver calls
+_driver_locks = weakref.WeakKeyDictionary()
+_driver_locks_guard = threading.Lock()
+
+def _driver_lock(driver):
+    """
+    Return the settings lock for a driver, creating it on first use
+    """
+    with _driver_locks_guard:
+        lock = _driver_locks.get(driver)
+        if lock is None:
+            lock = _driver_locks[driver] = threading.Lock()
+        return lock
+
+# Resolves with all elements once every one is visible, or null when the timeout expires.
+# Mutations trigger a check on the next frame; the interval catches purely visual changes.
+# The first check lets selector syntax errors escape so invalid selectors fail at once.
+_JS_WAIT_ALL_VISIBLE = """
+const values = arguments[0];
+const done = arguments[arguments.length - 1];
+const finders = [%s];
+const isVisible = """ + JS_IS_VISIBLE + """;
+let finished = false;
+const check = (strict) => {
+    if (finished) return;
+    const found = finders.map((find, i) => {
+        try { return find(values[i]); }
+        catch (e) { if (strict && e.name === 'SyntaxError') throw e; return null; }
+    });
+    if (found.every(isVisible)) finish(found);
+};
+const finish = result => {
+    finished = true;
+    observer.disconnect();
+    clearInterval(timer);
+    clearTimeout(expiry);
+    done(result);
+};
+const observer = new MutationObserver(() => requestAnimationFrame(check));
+observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true});
+const timer = setInterval(check, 100);
+const expiry = setTimeout(() => finish(null), arguments[1]);
+try {
+    check(true);
+} catch (e) {
+    observer.disconnect();
+    clearInterval(timer);
+    clearTimeout(expiry);
+    throw e;
+}
+"""
+
+def set_script_timeout(driver, seconds):
+    """
+    Set the driver's async script timeout, only issuing the command when the value changes
+    """
+    with _driver_lock(driver):
+        if _script_timeouts.get(driver) != seconds:
+            driver.set_script_timeout(seconds)
+            _script_timeouts[driver] = seconds
+
+def set_implicit_wait(driver, seconds):
+    """
+    Set the driver's implicit wait, only issuing the command when the value changes
+    """
+    with _driver_lock(driver):
+        if _implicit_waits.get(driver) != seconds:
+            driver.implicitly_wait(seconds)
+            _implicit_waits[driver] = seconds
+
+def _find_visible(driver, locator):
+    """
+    Return the element if it is present and displayed right now, otherwise None
+    """
+    try:
+        element = driver.find_element(*locator)
+        return element if element.is_displayed() else None
+    except (NoSuchElementException, StaleElementReferenceException):
+        return None
+
+def _poll(check, timeout, poll_frequency):
+    """
+    Call check until it returns something truthy or the timeout expires, returning its last result
+    
+    Polls every 50ms at first and slows down towards poll_frequency, so results that
+    are ready almost at once are seen without sitting out a full poll interval.
+    """
+    if timeout <= 0:
+        # A single check, e.g. for exists(timeout=0), needs no deadline or polling
+        return check()
+    
+    deadline = time.monotonic() + timeout
+    interval = min(0.05, poll_frequency)
+    while True:
+        result = check()
+        if result:
+            return result
+        
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return result
+        time.sleep(min(interval, remaining))
+        interval = min(interval * 1.5, poll_frequency)
+
+def wait_for_element(driver, locator, timeout=10, poll_frequency=0.5):
     """
     Wait for an element to be present and visible
+    
+    A missing element costs one WebDriver call per poll; visibility is only checked once it exists.
+    """
+    # Waits are explicit, so a lookup for a missing element must return at once
+    set_implicit_wait(driver, 0)
+    return _poll(lambda: _find_visible(driver, locator), timeout, poll_frequency)
+
+def wait_for_any(driver, locator, timeout=10, poll_frequency=0.5):
+    """
+    Wait for at least one element matching the locator to be present
+    
+    Returns:
+        List of all matching elements, or an empty list if none appeared in time
+    """
+    set_implicit_wait(driver, 0)
+    return _poll(lambda: driver.find_elements(*locator), timeout, poll_frequency)
+
+def _wait_for_each(driver, locators, deadline):
+    """
+    Wait for each locator in turn against a shared deadline, returning None as soon as one is missing
+    """
+    elements = []
+    for locator in locators:
+        element = wait_for_element(driver, locator, max(deadline - time.monotonic(), 0))
+        if element is None:
+            return None
+        elements.append(element)
+    return elements
+
+def wait_for_elements(driver, locators, timeout=10):
+    """
+    Wait for several elements to be visible using one in-browser wait instead of one wait per locator
+    
+    Returns:
+        List of elements in locator order, or None if they were not all visible in time
     """
+    deadline = time.monotonic() + timeout
+    if any(by_method not in JS_FINDERS for by_method, _ in locators):
+        # Link text can't be resolved in the page, so fall back to waiting for each in turn
+        return _wait_for_each(driver, locators, deadline)
+    
+    script = _JS_WAIT_ALL_VISIBLE % ", ".join(JS_FINDERS[by_method] for by_method, _ in locators)
+    # The driver must wait a little longer than the in-page timer before giving up on the script
+    set_script_timeout(driver, timeout + 1)
     try:
-        element = WebDriverWait(driver, timeout).until(
-            EC.visibility_of_element_located(locator)
-        )
-        return element
+        return driver.execute_async_script(script, [value for _, value in locators], timeout * 1000)
     except TimeoutException:
         return None
+    except WebDriverException as e:
+        # Invalid selectors and page unloads end the script early; wait through WebDriver instead
+        logger.info(f"In-browser wait failed, waiting for each element instead: {str(e)}")
+        return _wait_for_each(driver, locators, deadline)
@@ -2,48 +2,83 @@
 Logging utility for the framework
 """
 
+import atexit
 import logging
+import multiprocessing
 import os
+import queue
+import threading
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, MemoryHandler
+
+# Records are queued by the calling thread and written by a single background listener
+_log_queue = queue.SimpleQueue()
+# One handler feeding the queue, shared by every framework logger
+_queue_handler = QueueHandler(_log_queue)
+_listener = None
+_listener_lock = threading.Lock()
+
+def _start_listener():
+    """
+    Start the background listener that writes queued records to the log file and console
+    """
+    global _listener
+    with _listener_lock:
+        if _listener is None:
+            # Create logs directory if it doesn't exist
+            os.makedirs("logs", exist_ok=True)
+            
+            # Create file handler, rotated so a long run can't fill the disk. Rotation is not safe
+            # across processes, so worker processes each write their own file
+            log_file = f"logs/{datetime.now().strftime('%Y-%m-%d')}"
+            if multiprocessing.parent_process() is not None:
+                log_file += f"-{os.getpid()}"
+            log_file += ".log"
+            file_handler = RotatingFileHandler(log_file, maxBytes=50_000_000, backupCount=5)
+            
+            # Create console handler
+            console_handler = logging.StreamHandler()
+            
+            # Create formatter and add it to the handlers
+            formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+            file_handler.setFormatter(formatter)
+            console_handler.setFormatter(formatter)
+            
+            # Buffer file writes in batches, flushing straight away for errors
+            buffered_file_handler = MemoryHandler(capacity=1000, flushLevel=logging.ERROR, target=file_handler)
+            
+            _listener = QueueListener(_log_queue, buffered_file_handler, console_handler)
+            _listener.start()
+            # atexit runs these in reverse: drain the queue first, then flush the buffer to the file
+            atexit.register(buffered_file_handler.close)
+            atexit.register(_listener.stop)
 
 class Logger:
     def __init__(self, name, log_level=logging.INFO):
         self.logger = logging.getLogger(name)
         self.logger.setLevel(log_level)
         
-        # Create logs directory if it doesn't exist
-        os.makedirs("logs", exist_ok=True)
-        
-        # Create file handler
-        log_file = f"logs/{datetime.now().strftime('%Y-%m-%d')}.log"
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(log_level)
-        
-        # Create console handler
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(log_level)
-        
-        # Create formatter and add it to the handlers
-        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        file_handler.setFormatter(formatter)
-        console_handler.setFormatter(formatter)
-        
-        # Add the handlers to the logger
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(console_handler)
+        # Hand records to the listener thread so callers never block on I/O; attach only once per name
+        if _queue_handler not in self.logger.handlers:
+            _start_listener()
+            self.logger.addHandler(_queue_handler)
+            # The listener already writes to the console and log file, so don't repeat records through root handlers
+            self.logger.propagate = False
     
-    def info(self, message):
-        self.logger.info(message)
+    def isEnabledFor(self, level):
+        return self.logger.isEnabledFor(level)
     
-    def warning(self, message):
-        self.logger.warning(message)
+    def info(self, message, *args):
+        self.logger.info(message, *args)
     
-    def error(self, message):
-        self.logger.error(message)
+    def warning(self, message, *args):
+        self.logger.warning(message, *args)
     
-    def debug(self, message):
-        self.logger.debug(message)
+    def error(self, message, *args):
+        self.logger.error(message, *args)
     
-    def critical(self, message):
-        self.logger.critical(message)
-
+    def debug(self, message, *args):
+        self.logger.debug(message, *args)
+    
+    def critical(self, message, *args):
+        self.logger.critical(message, *args)
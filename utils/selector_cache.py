@@ -0,0 +1,96 @@
+"""
+Cached parsing of selector strings into Selenium locators
+"""
+
+import json
+from functools import lru_cache
+from selenium.webdriver.common.by import By
+
+SELECTOR_TYPES = {
+    "css": By.CSS_SELECTOR,
+    "xpath": By.XPATH,
+    "id": By.ID,
+    "name": By.NAME,
+    "tag": By.TAG_NAME,
+    "class": By.CLASS_NAME,
+    "link_text": By.LINK_TEXT,
+    "partial_link_text": By.PARTIAL_LINK_TEXT
+}
+
+# Selenium's find_element sends these locators to the driver as CSS selectors, built as prefix + value + suffix
+CSS_REWRITES = {
+    By.ID: ('[id="', '"]'),
+    By.NAME: ('[name="', '"]'),
+    By.CLASS_NAME: ('.', '')
+}
+
+# JavaScript functions that return the first element matching a selector value, for locators
+# that can be resolved in the page itself (link text has no DOM equivalent). Rewritten locators
+# are resolved from the same CSS selector Selenium would send, so ".a.b" as a class matches both classes
+JS_FINDERS = {
+    By.CSS_SELECTOR: "value => document.querySelector(value)",
+    By.XPATH: "value => document.evaluate(value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue",
+    By.TAG_NAME: "value => document.getElementsByTagName(value)[0]"
+}
+JS_FINDERS.update(
+    (by_method, f"value => document.querySelector({json.dumps(prefix)} + value + {json.dumps(suffix)})")
+    for by_method, (prefix, suffix) in CSS_REWRITES.items()
+)
+
+# JavaScript function approximating Selenium's is_displayed: the element must take up space,
+# not be visibility:hidden/collapse, and neither it nor any ancestor may have opacity 0
+JS_IS_VISIBLE = """el => {
+    if (!el || !(el.offsetWidth || el.offsetHeight || el.getClientRects().length)) return false;
+    const visibility = getComputedStyle(el).visibility;
+    if (visibility === 'hidden' || visibility === 'collapse') return false;
+    for (let node = el; node && node.nodeType === Node.ELEMENT_NODE; node = node.parentElement) {
+        if (getComputedStyle(node).opacity === '0') return false;
+    }
+    return true;
+}"""
+
+def get_by_method(selector_type):
+    """
+    Get the appropriate By method based on selector type
+    """
+    return SELECTOR_TYPES.get(selector_type.lower(), By.CSS_SELECTOR)
+
+@lru_cache(maxsize=4096)
+def parse_selector(selector, selector_type=None):
+    """
+    Parse selector string based on prefix to determine the selector type and value
+    Supported formats:
+    - "#element_id" -> (By.ID, "element_id")
+    - ".class_name" -> (By.CLASS_NAME, "class_name")
+    - "@name_value" -> (By.NAME, "name_value")
+    - "//xpath/expression" -> (By.XPATH, "//xpath/expression")
+    - "tag.class" or any other CSS -> (By.CSS_SELECTOR, selector)
+    
+    If selector_type is explicitly provided, it will override the automatic detection.
+    Results are cached, since tests pass the same selector strings over and over.
+    """
+    if selector_type:
+        return get_by_method(selector_type), selector
+    
+    # Auto-detect selector type based on prefix
+    if selector.startswith('#') and ' ' not in selector and '>' not in selector and ',' not in selector:
+        # ID selector: #element_id
+        return By.ID, selector[1:]
+    elif selector.startswith('.') and ' ' not in selector and '>' not in selector and ',' not in selector:
+        # Class selector: .class_name
+        return By.CLASS_NAME, selector[1:]
+    elif selector.startswith('@'):
+        # Name selector: @name_value
+        return By.NAME, selector[1:]
+    elif selector.startswith('//') or selector.startswith('(//'):
+        # XPath selector: //div[@id='element']
+        return By.XPATH, selector
+    elif selector.startswith('link='):
+        # Link text selector: link=Click Me
+        return By.LINK_TEXT, selector[5:]
+    elif selector.startswith('partial-link='):
+        # Partial link text selector: partial-link=Click
+        return By.PARTIAL_LINK_TEXT, selector[13:]
+    else:
+        # Default to CSS selector
+        return By.CSS_SELECTOR, selector
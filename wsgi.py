@@ -1,10 +1,16 @@
 """
 WSGI entry point for the Flask application
+
+Serve with gevent workers so result polling doesn't block running tests:
+    gunicorn wsgi:application   (settings in gunicorn.conf.py)
 """
 
+from gevent import monkey
+monkey.patch_all()
+
 from app import create_app
 
 application = create_app()
 
 if __name__ == "__main__":
-    application.run()
\ No newline at end of file
+    application.run()